@@ -1,19 +1,14 @@
-import sys
-from pathlib import Path
-
-# Add project paths for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / "dashboard"))
+import functools
 
 import solara
+import solara.lab
 import pandas as pd
 from datetime import date, datetime, timedelta
 from typing import Dict, Any, Optional
 import plotly.graph_objects as go
 
-from utils.data_loader import DataLoader
-from components.charts import (
+from dashboard.utils.data_loader import DataLoader
+from dashboard.components.charts import (
     create_productivity_trend_chart,
     create_category_breakdown_chart,
     create_daily_activity_chart,
@@ -23,14 +18,23 @@ from components.charts import (
     create_productivity_vs_time_scatter
 )
 
-# Global data loader
-data_loader = DataLoader()
+# Per-session data loader, provided by Page and shared by every view
+data_loader_context = solara.create_context(None)
 
 # Reactive state
 days_filter = solara.reactive(7)
 selected_date = solara.reactive(date.today())
 current_page = solara.reactive("overview")
 
+# Navigation pages (key, label)
+PAGES = (
+    ("overview", "📈 Overview"),
+    ("analytics", "🔍 Analytics"),
+    ("historical", "📅 Historical")
+)
+ACTIVE_TAB_STYLE = {"background-color": "#e3f2fd"}
+INACTIVE_TAB_STYLE = {"background-color": "transparent"}
+
 @solara.component
 def Header():
     """App header with navigation."""
@@ -40,29 +44,21 @@ def Header():
             solara.Markdown("*Analyze your browsing patterns and productivity*")
         
         with solara.Column(size=4):
-            solara.Markdown(f"**Today:** {date.today().strftime('%B %d, %Y')}")
+            today = date.today()
+            today_label = solara.use_memo(lambda: f"**Today:** {today.strftime('%B %d, %Y')}", dependencies=[today])
+            solara.Markdown(today_label)
 
 @solara.component
 def NavigationTabs():
     """Navigation tabs for different pages."""
-    pages = [
-        ("overview", "📈 Overview"),
-        ("analytics", "🔍 Analytics"),
-        ("historical", "📅 Historical")
-    ]
-    
     with solara.Row():
-        for page_key, page_name in pages:
+        for page_key, page_name in PAGES:
             is_active = current_page.value == page_key
-            style = {"background-color": "#e3f2fd" if is_active else "transparent"}
-            
-            def set_page(page=page_key):
-                current_page.set(page)
             
             solara.Button(
                 page_name,
-                on_click=lambda: set_page(),
-                style=style
+                on_click=functools.partial(current_page.set, page_key),
+                style=ACTIVE_TAB_STYLE if is_active else INACTIVE_TAB_STYLE
             )
 
 @solara.component
@@ -85,40 +81,49 @@ def Filters():
                 value=selected_date
             )
 
+@solara.component
+def Chart(create_chart, data: pd.DataFrame):
+    """Plotly chart whose figure is rebuilt only when its input data changes."""
+    fig = solara.use_memo(
+        lambda: create_chart(data),
+        dependencies=[create_chart, id(data), len(data)]
+    )
+    solara.FigurePlotly(fig)
+
 @solara.component
 def SummaryCards(summary_stats: Dict[str, Any]):
     """Summary statistics cards."""
+    def format_cards():
+        hours = summary_stats['total_time'] // 60
+        minutes = summary_stats['total_time'] % 60
+        return (
+            (f"### {summary_stats['total_sites']}", "**Total Sites Visited**"),
+            (f"### {hours}h {minutes}m", "**Total Time Spent**"),
+            (f"### {summary_stats['avg_productivity']}/10", "**Average Productivity**"),
+            (f"### {summary_stats['active_days']}", "**Active Days**")
+        )
+    
+    cards = solara.use_memo(format_cards, dependencies=[id(summary_stats)])
+    
     with solara.Row():
-        with solara.Column(size=3):
-            with solara.Card():
-                solara.Markdown(f"### {summary_stats['total_sites']}")
-                solara.Markdown("**Total Sites Visited**")
-        
-        with solara.Column(size=3):
-            with solara.Card():
-                hours = summary_stats['total_time'] // 60
-                minutes = summary_stats['total_time'] % 60
-                solara.Markdown(f"### {hours}h {minutes}m")
-                solara.Markdown("**Total Time Spent**")
-        
-        with solara.Column(size=3):
-            with solara.Card():
-                solara.Markdown(f"### {summary_stats['avg_productivity']}/10")
-                solara.Markdown("**Average Productivity**")
-        
-        with solara.Column(size=3):
-            with solara.Card():
-                solara.Markdown(f"### {summary_stats['active_days']}")
-                solara.Markdown("**Active Days**")
+        for value, label in cards:
+            with solara.Column(size=3):
+                with solara.Card():
+                    solara.Markdown(value)
+                    solara.Markdown(label)
 
 @solara.component
 def OverviewPage():
     """Main overview page."""
-    # Load data
-    summary_stats = data_loader.get_summary_stats(days_filter.value)
-    productivity_data = data_loader.get_productivity_trend(days_filter.value)
-    category_data = data_loader.get_category_breakdown(days_filter.value)
-    daily_stats = data_loader.load_daily_stats(selected_date.value)
+    data_loader = solara.use_context(data_loader_context)
+    days = days_filter.value
+    target_date = selected_date.value
+    
+    # Load data, recomputing only when the relevant filter changes
+    summary_stats = solara.use_memo(lambda: data_loader.get_summary_stats(days), dependencies=[days])
+    productivity_data = solara.use_memo(lambda: data_loader.get_productivity_trend(days), dependencies=[days])
+    category_data = solara.use_memo(lambda: data_loader.get_category_totals(days), dependencies=[days])
+    daily_stats = solara.use_memo(lambda: data_loader.load_daily_stats(target_date), dependencies=[target_date])
     
     # Summary cards
     SummaryCards(summary_stats)
@@ -127,96 +132,120 @@ def OverviewPage():
     with solara.Row():
         with solara.Column(size=6):
             with solara.Card("Productivity Trend"):
-                fig = create_productivity_trend_chart(productivity_data)
-                solara.FigurePlotly(fig)
+                Chart(create_productivity_trend_chart, productivity_data)
         
         with solara.Column(size=6):
             with solara.Card("Category Breakdown"):
-                fig = create_category_breakdown_chart(category_data)
-                solara.FigurePlotly(fig)
+                Chart(create_category_breakdown_chart, category_data)
     
     with solara.Row():
         with solara.Column(size=12):
-            with solara.Card(f"Daily Activity - {selected_date.value.strftime('%B %d, %Y')}"):
-                fig = create_daily_activity_chart(daily_stats)
-                solara.FigurePlotly(fig)
+            with solara.Card(f"Daily Activity - {target_date.strftime('%B %d, %Y')}"):
+                Chart(create_daily_activity_chart, daily_stats)
 
 @solara.component
 def AnalyticsPage():
     """Advanced analytics page."""
-    # Load data
-    domain_data = data_loader.load_domain_stats(selected_date.value)
-    heatmap_data = data_loader.get_activity_heatmap_data(days_filter.value)
-    productivity_data = data_loader.get_productivity_trend(days_filter.value)
+    data_loader = solara.use_context(data_loader_context)
+    days = days_filter.value
+    target_date = selected_date.value
+    
+    # Load data, recomputing only when the relevant filter changes
+    domain_data = solara.use_memo(lambda: data_loader.load_domain_stats(target_date), dependencies=[target_date])
+    entries_df = solara.use_memo(lambda: data_loader.load_journal_entries(days), dependencies=[days])
+    
+    # The heatmap is the heaviest query, so load it in the background
+    heatmap_task = solara.lab.use_task(lambda: data_loader.get_activity_heatmap_data(days), dependencies=[days])
     
     with solara.Row():
         with solara.Column(size=6):
             with solara.Card("Top Domains"):
-                fig = create_top_domains_chart(domain_data)
-                solara.FigurePlotly(fig)
+                Chart(create_top_domains_chart, domain_data)
         
         with solara.Column(size=6):
             with solara.Card("Weekly Pattern"):
-                fig = create_weekly_pattern_chart(heatmap_data)
-                solara.FigurePlotly(fig)
+                if heatmap_task.finished:
+                    Chart(create_weekly_pattern_chart, heatmap_task.value)
+                else:
+                    solara.ProgressLinear(True)
     
     with solara.Row():
         with solara.Column(size=6):
             with solara.Card("Activity Heatmap"):
-                fig = create_activity_heatmap(heatmap_data)
-                solara.FigurePlotly(fig)
+                if heatmap_task.finished:
+                    Chart(create_activity_heatmap, heatmap_task.value)
+                else:
+                    solara.ProgressLinear(True)
         
         with solara.Column(size=6):
             with solara.Card("Productivity vs Time Correlation"):
-                entries_df = data_loader.load_journal_entries(days_filter.value)
-                fig = create_productivity_vs_time_scatter(entries_df)
-                solara.FigurePlotly(fig)
+                Chart(create_productivity_vs_time_scatter, entries_df)
 
 @solara.component
 def HistoricalPage():
     """Historical data view."""
-    entries_df = data_loader.load_journal_entries(days_filter.value)
+    data_loader = solara.use_context(data_loader_context)
+    days = days_filter.value
+    entries_df = solara.use_memo(lambda: data_loader.load_journal_entries(days), dependencies=[days])
     
     with solara.Card("Historical Journal Entries"):
         if entries_df.empty:
             solara.Markdown("No historical data available.")
-        else:
-            # Display data table
-            display_df = entries_df[['date', 'total_sites_visited', 'total_time_spent', 'productivity_score']].copy()
-            display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
-            display_df.columns = ['Date', 'Sites Visited', 'Time Spent (min)', 'Productivity Score']
-            
-            solara.DataFrame(display_df)
+            return
+        
+        # Display data table
+        # assign() yields a new frame, so the cached entries are never mutated
+        display_df = entries_df[['date', 'total_sites_visited', 'total_time_spent', 'productivity_score']].assign(
+            date=entries_df['date'].dt.strftime('%Y-%m-%d')
+        )
+        display_df.columns = ['Date', 'Sites Visited', 'Time Spent (min)', 'Productivity Score']
+        
+        solara.DataFrame(display_df)
     
     # Export functionality
     with solara.Card("Data Export"):
         solara.Markdown("**Export Options:**")
         
-        def export_json():
-            # This would trigger a download in a real implementation
-            solara.Info("JSON export would be triggered here")
+        # Serialize lazily, only when a download is actually requested
+        def export_json() -> bytes:
+            return display_df.to_json(orient='records', indent=2).encode('utf-8')
         
-        def export_csv():
-            # This would trigger a download in a real implementation
-            solara.Info("CSV export would be triggered here")
+        def export_csv() -> bytes:
+            return display_df.to_csv(index=False).encode('utf-8')
         
         with solara.Row():
-            solara.Button("Export JSON", on_click=export_json)
-            solara.Button("Export CSV", on_click=export_csv)
+            solara.FileDownload(export_json, filename=f"journal_last_{days}_days.json", label="Export JSON")
+            solara.FileDownload(export_csv, filename=f"journal_last_{days}_days.csv", label="Export CSV")
 
 @solara.component
-def ErrorBoundary(children):
-    """Error boundary to catch and display errors gracefully."""
-    try:
-        return children
-    except Exception as e:
+def StatusMessage(message: str, kind: str = "info"):
+    """Status message rendered as an error, warning or info pill."""
+    widget = {"error": solara.Error, "warning": solara.Warning}.get(kind, solara.Info)
+    widget(message)
+
+@solara.component
+def ErrorBoundary(children=[]):
+    """Error boundary that catches exceptions raised while rendering its children."""
+    # A plain try/except never sees child errors, since children render later
+    exception, clear_exception = solara.use_exception()
+    
+    if exception:
         with solara.Card("Error"):
-            solara.Error(f"An error occurred: {str(e)}")
+            StatusMessage(f"An error occurred: {exception}", kind="error")
             solara.Markdown("Please check your data and try again.")
+            solara.Button("Try again", on_click=clear_exception)
+    else:
+        solara.Column(children=children)
 
 @solara.component
 def Page():
     """Main page component."""
+    # One loader per session; every view reads and invalidates the same cache
+    data_loader = solara.use_memo(DataLoader, dependencies=[])
+    solara.provide_context(data_loader_context, data_loader)
+    # Close the session's database connection when the page unmounts
+    solara.use_effect(lambda: data_loader.db_manager.close, [])
+    
     with ErrorBoundary():
         # Header
         Header()
@@ -241,6 +270,7 @@ def Page():
 @solara.component
 def AutoRefresh():
     """Auto-refresh component to update data periodically."""
+    data_loader = solara.use_context(data_loader_context)
     refresh_interval = 300  # 5 minutes in seconds
     
     def refresh_data():
@@ -251,13 +281,18 @@ def AutoRefresh():
     
     # In a real implementation, you'd set up a timer here
     # For now, we'll just provide a manual refresh button
+    refreshed, set_refreshed = solara.use_state(False)
+    
     with solara.Row():
         with solara.Column(size=12):
             def manual_refresh():
                 # Clear any cached data and force reload
-                solara.Info("Data refreshed!")
+                data_loader.clear_cache()
+                set_refreshed(True)
             
             solara.Button("🔄 Refresh Data", on_click=manual_refresh)
+            if refreshed:
+                StatusMessage("Data refreshed!")
 
 def main(host: str = "localhost", port: int = 8765):
     """Main entry point for the dashboard."""
@@ -1,268 +1,226 @@
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 from typing import Dict, Any, List
 import solara
 
+# Color map for categories
+CATEGORY_COLORS = {
+    'Development': '#2E8B57',
+    'Entertainment': '#FF6347',
+    'Social Media': '#FF69B4',
+    'Research': '#4682B4',
+    'News': '#32CD32',
+    'Communication': '#9370DB',
+    'Shopping': '#FFD700',
+    'Uncategorized': '#808080'
+}
+
+# Colors indexed by category code; the trailing default catches unknown
+# categories, whose code is -1
+CATEGORY_DTYPE = pd.CategoricalDtype(categories=list(CATEGORY_COLORS), ordered=False)
+CATEGORY_COLOR_ARRAY = np.array(list(CATEGORY_COLORS.values()) + ['#808080'])
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def _build_figure(data: List[Dict[str, Any]], layout: Dict[str, Any]) -> go.Figure:
+    """Build a figure from plain trace/layout dicts, skipping Plotly's per-property validation."""
+    return go.Figure({'data': data, 'layout': layout}, _validate=False)
+
+def _category_colors(categories: pd.Series) -> np.ndarray:
+    """Map a category column to hex colors without a per-row lookup."""
+    return CATEGORY_COLOR_ARRAY[categories.astype(CATEGORY_DTYPE).cat.codes.to_numpy()]
+
+def _empty_figure() -> go.Figure:
+    """Create a placeholder figure for charts without data."""
+    return _build_figure([], {
+        'annotations': [{
+            'text': 'No data available',
+            'xref': 'paper', 'yref': 'paper',
+            'x': 0.5, 'y': 0.5, 'showarrow': False
+        }]
+    })
+
 def create_productivity_trend_chart(data: pd.DataFrame) -> go.Figure:
     """Create productivity trend line chart."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
-    
-    fig = go.Figure()
+        return _empty_figure()
     
     # Add productivity score line
-    fig.add_trace(go.Scatter(
-        x=data['date'],
-        y=data['productivity_score'],
-        mode='lines+markers',
-        name='Productivity Score',
-        line=dict(color='#1f77b4', width=2),
-        marker=dict(size=6)
-    ))
+    traces = [{
+        'type': 'scatter',
+        'x': data['date'].to_numpy(),
+        'y': data['productivity_score'].to_numpy(),
+        'mode': 'lines+markers',
+        'name': 'Productivity Score',
+        'line': {'color': '#1f77b4', 'width': 2},
+        'marker': {'size': 6}
+    }]
     
     # Add moving average if available
     if 'productivity_ma' in data.columns:
-        fig.add_trace(go.Scatter(
-            x=data['date'],
-            y=data['productivity_ma'],
-            mode='lines',
-            name='7-day Moving Average',
-            line=dict(color='#ff7f0e', width=2, dash='dash')
-        ))
-    
-    fig.update_layout(
-        title='Productivity Trend Over Time',
-        xaxis_title='Date',
-        yaxis_title='Productivity Score (0-10)',
-        yaxis=dict(range=[0, 10]),
-        hovermode='x unified',
-        template='plotly_white'
-    )
-    
-    return fig
+        traces.append({
+            'type': 'scatter',
+            'x': data['date'].to_numpy(),
+            'y': data['productivity_ma'].to_numpy(),
+            'mode': 'lines',
+            'name': '7-day Moving Average',
+            'line': {'color': '#ff7f0e', 'width': 2, 'dash': 'dash'}
+        })
+    
+    return _build_figure(traces, {
+        'title': {'text': 'Productivity Trend Over Time'},
+        'xaxis': {'title': {'text': 'Date'}},
+        'yaxis': {'title': {'text': 'Productivity Score (0-10)'}, 'range': [0, 10]},
+        'hovermode': 'x unified',
+        'template': 'plotly_white'
+    })
 
 def create_category_breakdown_chart(data: pd.DataFrame) -> go.Figure:
     """Create category breakdown pie chart."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
+        return _empty_figure()
     
     # Aggregate by category
     category_totals = data.groupby('category')['time_spent'].sum().reset_index()
     category_totals = category_totals.sort_values('time_spent', ascending=False)
     
-    # Color map for categories
-    color_map = {
-        'Development': '#2E8B57',
-        'Entertainment': '#FF6347',
-        'Social Media': '#FF69B4',
-        'Research': '#4682B4',
-        'News': '#32CD32',
-        'Communication': '#9370DB',
-        'Shopping': '#FFD700',
-        'Uncategorized': '#808080'
-    }
-    
-    colors = [color_map.get(cat, '#808080') for cat in category_totals['category']]
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=category_totals['category'],
-        values=category_totals['time_spent'],
-        marker_colors=colors,
-        textinfo='label+percent',
-        hovertemplate='<b>%{label}</b><br>Time: %{value} minutes<br>Percentage: %{percent}<extra></extra>'
-    )])
-    
-    fig.update_layout(
-        title='Time Spent by Category',
-        template='plotly_white'
-    )
-    
-    return fig
+    colors = _category_colors(category_totals['category'])
+    
+    return _build_figure([{
+        'type': 'pie',
+        'labels': category_totals['category'].to_numpy(),
+        'values': category_totals['time_spent'].to_numpy(),
+        'marker': {'colors': colors},
+        'textinfo': 'label+percent',
+        'hovertemplate': '<b>%{label}</b><br>Time: %{value} minutes<br>Percentage: %{percent}<extra></extra>'
+    }], {
+        'title': {'text': 'Time Spent by Category'},
+        'template': 'plotly_white'
+    })
 
 def create_daily_activity_chart(data: pd.DataFrame) -> go.Figure:
     """Create daily activity bar chart."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
+        return _empty_figure()
     
     # Ensure data is sorted by hour
     data = data.sort_values('hour')
     
-    fig = go.Figure(data=[
-        go.Bar(
-            x=data['hour'],
-            y=data['time_spent'],
-            name='Time Spent',
-            marker_color='lightblue',
-            hovertemplate='<b>Hour %{x}:00</b><br>Time Spent: %{y} minutes<br>Sites Visited: %{customdata}<extra></extra>',
-            customdata=data['sites_visited']
-        )
-    ])
-    
-    fig.update_layout(
-        title='Hourly Activity Distribution',
-        xaxis_title='Hour of Day',
-        yaxis_title='Time Spent (minutes)',
-        xaxis=dict(tickmode='linear', tick0=0, dtick=2),
-        template='plotly_white'
-    )
-    
-    return fig
+    return _build_figure([{
+        'type': 'bar',
+        'x': data['hour'].to_numpy(),
+        'y': data['time_spent'].to_numpy(),
+        'name': 'Time Spent',
+        'marker': {'color': 'lightblue'},
+        'hovertemplate': '<b>Hour %{x}:00</b><br>Time Spent: %{y} minutes<br>Sites Visited: %{customdata}<extra></extra>',
+        'customdata': data['sites_visited'].to_numpy()
+    }], {
+        'title': {'text': 'Hourly Activity Distribution'},
+        'xaxis': {'title': {'text': 'Hour of Day'}, 'tickmode': 'linear', 'tick0': 0, 'dtick': 2},
+        'yaxis': {'title': {'text': 'Time Spent (minutes)'}},
+        'template': 'plotly_white'
+    })
 
 def create_activity_heatmap(data: pd.DataFrame) -> go.Figure:
     """Create activity heatmap showing day vs hour."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
+        return _empty_figure()
     
     # Pivot data for heatmap
     heatmap_data = data.pivot(index='date', columns='hour', values='activity_level')
     heatmap_data = heatmap_data.fillna(0)
     
-    fig = go.Figure(data=go.Heatmap(
-        z=heatmap_data.values,
-        x=[f"{h:02d}:00" for h in range(24)],
-        y=[d.strftime('%Y-%m-%d') for d in heatmap_data.index],
-        colorscale='Blues',
-        hovertemplate='<b>%{y}</b><br>Hour: %{x}<br>Activity: %{z} minutes<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title='Activity Heatmap (Date vs Hour)',
-        xaxis_title='Hour of Day',
-        yaxis_title='Date',
-        template='plotly_white'
-    )
-    
-    return fig
+    # float32 halves the typed-array payload Plotly base64-encodes for the browser
+    z = heatmap_data.to_numpy(dtype=np.float32)
+    x_labels = [f"{h:02d}:00" for h in range(24)]
+    y_labels = [d.strftime('%Y-%m-%d') for d in heatmap_data.index]
+    
+    return _build_figure([{
+        'type': 'heatmap',
+        'z': z,
+        'x': x_labels,
+        'y': y_labels,
+        'colorscale': 'Blues',
+        'hovertemplate': '<b>%{y}</b><br>Hour: %{x}<br>Activity: %{z} minutes<extra></extra>'
+    }], {
+        'title': {'text': 'Activity Heatmap (Date vs Hour)'},
+        'xaxis': {'title': {'text': 'Hour of Day'}},
+        'yaxis': {'title': {'text': 'Date'}},
+        'template': 'plotly_white'
+    })
 
 def create_top_domains_chart(data: pd.DataFrame) -> go.Figure:
     """Create top domains horizontal bar chart."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
+        return _empty_figure()
     
     # Sort by time spent and take top 10
     data = data.sort_values('time_spent', ascending=True).tail(10)
     
     # Color by category
-    category_colors = {
-        'Development': '#2E8B57',
-        'Entertainment': '#FF6347',
-        'Social Media': '#FF69B4',
-        'Research': '#4682B4',
-        'News': '#32CD32',
-        'Communication': '#9370DB',
-        'Shopping': '#FFD700',
-        'Uncategorized': '#808080'
-    }
-    
-    colors = [category_colors.get(cat, '#808080') for cat in data['category']]
-    
-    fig = go.Figure(data=[
-        go.Bar(
-            x=data['time_spent'],
-            y=data['domain'],
-            orientation='h',
-            marker_color=colors,
-            hovertemplate='<b>%{y}</b><br>Time: %{x} minutes<br>Visits: %{customdata}<extra></extra>',
-            customdata=data['visits']
-        )
-    ])
-    
-    fig.update_layout(
-        title='Top Domains by Time Spent',
-        xaxis_title='Time Spent (minutes)',
-        yaxis_title='Domain',
-        template='plotly_white'
-    )
-    
-    return fig
+    colors = _category_colors(data['category'])
+    
+    return _build_figure([{
+        'type': 'bar',
+        'x': data['time_spent'].to_numpy(),
+        'y': data['domain'].to_numpy(),
+        'orientation': 'h',
+        'marker': {'color': colors},
+        'hovertemplate': '<b>%{y}</b><br>Time: %{x} minutes<br>Visits: %{customdata}<extra></extra>',
+        'customdata': data['visits'].to_numpy()
+    }], {
+        'title': {'text': 'Top Domains by Time Spent'},
+        'xaxis': {'title': {'text': 'Time Spent (minutes)'}},
+        'yaxis': {'title': {'text': 'Domain'}},
+        'template': 'plotly_white'
+    })
 
 def create_weekly_pattern_chart(data: pd.DataFrame) -> go.Figure:
     """Create weekly pattern chart showing average activity by day of week."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
-    
-    # Group by day of week and calculate average activity
-    weekly_pattern = data.groupby('day_of_week')['activity_level'].mean().reset_index()
-    
-    # Map day numbers to names
-    day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    weekly_pattern['day_name'] = weekly_pattern['day_of_week'].map(lambda x: day_names[x])
-    
-    fig = go.Figure(data=[
-        go.Bar(
-            x=weekly_pattern['day_name'],
-            y=weekly_pattern['activity_level'],
-            marker_color='lightgreen',
-            hovertemplate='<b>%{x}</b><br>Average Activity: %{y:.1f} minutes<extra></extra>'
-        )
-    ])
-    
-    fig.update_layout(
-        title='Average Activity by Day of Week',
-        xaxis_title='Day of Week',
-        yaxis_title='Average Activity (minutes)',
-        template='plotly_white'
-    )
-    
-    return fig
+        return _empty_figure()
+    
+    # Group on an ordered day-name categorical so bars sort Monday to Sunday
+    day_names = pd.Categorical.from_codes(data['day_of_week'], categories=DAY_NAMES, ordered=True)
+    weekly_pattern = data['activity_level'].groupby(day_names, observed=True).mean()
+    
+    return _build_figure([{
+        'type': 'bar',
+        'x': weekly_pattern.index.astype(str).to_numpy(),
+        'y': weekly_pattern.to_numpy(),
+        'marker': {'color': 'lightgreen'},
+        'hovertemplate': '<b>%{x}</b><br>Average Activity: %{y:.1f} minutes<extra></extra>'
+    }], {
+        'title': {'text': 'Average Activity by Day of Week'},
+        'xaxis': {'title': {'text': 'Day of Week'}},
+        'yaxis': {'title': {'text': 'Average Activity (minutes)'}},
+        'template': 'plotly_white'
+    })
 
 def create_productivity_vs_time_scatter(data: pd.DataFrame) -> go.Figure:
     """Create scatter plot of productivity vs time spent."""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", 
-                          xref="paper", yref="paper",
-                          x=0.5, y=0.5, showarrow=False)
-        return fig
-    
-    fig = go.Figure(data=[
-        go.Scatter(
-            x=data['total_time_spent'],
-            y=data['productivity_score'],
-            mode='markers',
-            marker=dict(
-                size=10,
-                color=data['productivity_score'],
-                colorscale='RdYlBu',
-                colorbar=dict(title="Productivity Score"),
-                line=dict(width=1, color='black')
-            ),
-            text=data['date'].dt.strftime('%Y-%m-%d'),
-            hovertemplate='<b>%{text}</b><br>Time Spent: %{x} minutes<br>Productivity: %{y}/10<extra></extra>'
-        )
-    ])
-    
-    fig.update_layout(
-        title='Productivity vs Time Spent',
-        xaxis_title='Time Spent (minutes)',
-        yaxis_title='Productivity Score (0-10)',
-        yaxis=dict(range=[0, 10]),
-        template='plotly_white'
-    )
-    
-    return fig
\ No newline at end of file
+        return _empty_figure()
+    
+    return _build_figure([{
+        'type': 'scatter',
+        'x': data['total_time_spent'].to_numpy(),
+        'y': data['productivity_score'].to_numpy(),
+        'mode': 'markers',
+        'marker': {
+            'size': 10,
+            'color': data['productivity_score'].to_numpy(),
+            'colorscale': 'RdYlBu',
+            'colorbar': {'title': {'text': 'Productivity Score'}},
+            'line': {'width': 1, 'color': 'black'}
+        },
+        'text': data['date'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'hovertemplate': '<b>%{text}</b><br>Time Spent: %{x} minutes<br>Productivity: %{y}/10<extra></extra>'
+    }], {
+        'title': {'text': 'Productivity vs Time Spent'},
+        'xaxis': {'title': {'text': 'Time Spent (minutes)'}},
+        'yaxis': {'title': {'text': 'Productivity Score (0-10)'}, 'range': [0, 10]},
+        'template': 'plotly_white'
+    })
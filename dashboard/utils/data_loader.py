@@ -1,46 +1,85 @@
-import sys
-import os
-from pathlib import Path
+import json
+import time
+import functools
 from datetime import date, datetime, timedelta
 from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 
-# Add src to path for imports
-project_root = Path(__file__).parent.parent.parent
-src_path = project_root / "src"
-sys.path.insert(0, str(src_path))
-sys.path.insert(0, str(project_root))
+from src.config import ConfigManager
+from src.database import DatabaseManager
 
-try:
-    from src.config import ConfigManager
-    from src.database import DatabaseManager
-except ImportError:
-    # Fallback for different import scenarios
-    from config import ConfigManager
-    from database import DatabaseManager
+CACHE_MAX_ENTRIES = 32
+
+# raw_data is never shown by the dashboard, so it is not fetched here;
+# top_categories stays a JSON string until a view needs the breakdown
+JOURNAL_ENTRIES_SQL = """
+    SELECT id, date, total_sites_visited, total_time_spent, top_categories,
+           productivity_score, summary, created_at
+    FROM journal_entries WHERE date BETWEEN ? AND ? ORDER BY date
+"""
+
+JOURNAL_ENTRIES_DTYPES = {
+    'total_sites_visited': 'int32',
+    'total_time_spent': 'int32',
+    'productivity_score': 'float32'
+}
+
+def _cached(method):
+    """Memoize a DataLoader method for the loader's TTL, invalidating daily."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Include today's date so day-relative windows roll over at midnight
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), date.today())
+        now = time.monotonic()
+        
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.cache_ttl:
+            return hit[1]
+        
+        result = method(self, *args, **kwargs)
+        self._cache[key] = (now, result)
+        
+        # Drop the oldest entries once the cache grows past its bound
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.pop(next(iter(self._cache)))
+        
+        return result
+    return wrapper
 
 class DataLoader:
     def __init__(self):
         self.config = ConfigManager()
         self.db_manager = DatabaseManager(self.config.database_path)
+        self.cache_ttl = self.config.get('dashboard.auto_refresh', 300)
+        self._cache: Dict[tuple, tuple] = {}
+    
+    def clear_cache(self):
+        """Drop all memoized query results so the next call hits the database."""
+        self._cache.clear()
     
+    @_cached
     def load_journal_entries(self, days: int = 30) -> pd.DataFrame:
         """Load recent journal entries as DataFrame."""
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        entries = self.db_manager.get_journal_entries_range(start_date, end_date)
-        
-        if not entries:
+        # Let pandas build typed columns straight from the cursor
+        with self.db_manager.connection() as conn:
+            df = pd.read_sql_query(
+                JOURNAL_ENTRIES_SQL,
+                conn,
+                params=(start_date.isoformat(), end_date.isoformat()),
+                parse_dates=['date', 'created_at'],
+                dtype=JOURNAL_ENTRIES_DTYPES
+            )
+        
+        if df.empty:
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        df = pd.DataFrame(entries)
-        df['date'] = pd.to_datetime(df['date'])
-        df['created_at'] = pd.to_datetime(df['created_at'])
-        
         return df
     
+    @_cached
     def load_daily_stats(self, target_date: date = None) -> pd.DataFrame:
         """Load hourly stats for a specific date."""
         target_date = target_date or date.today()
@@ -59,7 +98,7 @@ class DataLoader:
                 'time_spent': stat['time_spent']
             })
         
-        return pd.DataFrame(data)
+        return pd.DataFrame(data).astype({'hour': 'int32', 'sites_visited': 'int32', 'time_spent': 'int32'})
     
     def load_category_breakdown(self, days: int = 7) -> pd.DataFrame:
         """Load category breakdown for recent days."""
@@ -68,23 +107,38 @@ class DataLoader:
         if entries_df.empty:
             return pd.DataFrame()
         
-        # Extract category data
-        category_data = []
-        for _, entry in entries_df.iterrows():
-            entry_date = entry['date'].date()
-            categories = entry['top_categories']
-            
-            for category in categories:
-                category_data.append({
-                    'date': entry_date,
-                    'category': category['category'],
-                    'time_spent': category['time_spent'],
-                    'visits': category.get('visits', 0),
-                    'productivity_weight': category.get('productivity_weight', 0.0)
-                })
-        
-        return pd.DataFrame(category_data)
+        # Parse the category JSON only here, where it is actually needed
+        exploded = entries_df[['date']].assign(
+            top_categories=entries_df['top_categories'].map(lambda raw: json.loads(raw or '[]'))
+        )
+        
+        # Flatten one row per (date, category) without a Python-level loop
+        exploded = exploded.explode('top_categories', ignore_index=True)
+        exploded = exploded.dropna(subset=['top_categories'])
+        
+        if exploded.empty:
+            return pd.DataFrame()
+        
+        categories = pd.json_normalize(exploded['top_categories'].tolist())
+        categories = categories.reindex(columns=['category', 'time_spent', 'visits', 'productivity_weight'])
+        categories = categories.fillna({'visits': 0, 'productivity_weight': 0.0})
+        
+        return pd.concat([exploded['date'].dt.date.reset_index(drop=True), categories], axis=1)
     
+    @_cached
+    def get_category_totals(self, days: int = 7) -> pd.DataFrame:
+        """Get total time spent per category, aggregated in SQL."""
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days)
+        
+        totals = self.db_manager.get_category_totals(start_date, end_date)
+        
+        if not totals:
+            return pd.DataFrame()
+        
+        return pd.DataFrame.from_records(totals, columns=['category', 'time_spent'])
+    
+    @_cached
     def load_domain_stats(self, target_date: date = None) -> pd.DataFrame:
         """Load domain statistics for a specific date."""
         target_date = target_date or date.today()
@@ -106,8 +160,9 @@ class DataLoader:
                 'titles_count': len(stats.get('titles', []))
             })
         
-        return pd.DataFrame(data)
+        return pd.DataFrame(data).astype({'visits': 'int32', 'time_spent': 'int32', 'titles_count': 'int32'})
     
+    @_cached
     def get_productivity_trend(self, days: int = 30) -> pd.DataFrame:
         """Get productivity score trend over time."""
         entries_df = self.load_journal_entries(days)
@@ -124,35 +179,36 @@ class DataLoader:
         
         return trend_df
     
+    @_cached
     def get_activity_heatmap_data(self, days: int = 30) -> pd.DataFrame:
         """Get hourly activity data for heatmap visualization."""
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        # Get all dates in range
+        # Build the (date, hour) grid column-wise instead of one record per cell
         date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-        
-        heatmap_data = []
-        
-        for current_date in date_range:
-            current_date = current_date.date()
-            daily_stats = self.db_manager.get_daily_stats(current_date)
+        n_days = len(date_range)
+        dates = np.repeat(date_range.values, 24)
+        hours = np.tile(np.arange(24, dtype=np.int8), n_days)
+        activity = np.zeros(n_days * 24, dtype=np.int32)
+        
+        # Single range query instead of one query per day
+        rows = self.db_manager.get_hourly_stats_range(start_date, end_date)
+        if rows:
+            stats_df = pd.DataFrame.from_records(rows, columns=['date', 'hour', 'sites_visited', 'time_spent'])
             
-            # Create entry for each hour
-            for hour in range(24):
-                activity_level = 0
-                if hour in daily_stats:
-                    activity_level = daily_stats[hour]['time_spent']
-                
-                heatmap_data.append({
-                    'date': current_date,
-                    'hour': hour,
-                    'activity_level': activity_level,
-                    'weekday': current_date.strftime('%A'),
-                    'day_of_week': current_date.weekday()
-                })
-        
-        return pd.DataFrame(heatmap_data)
+            # Scatter each stored row into its cell via a linear (day, hour) index
+            date_idx = date_range.get_indexer(pd.to_datetime(stats_df['date']))
+            hour_idx = stats_df['hour'].to_numpy()
+            valid = (date_idx >= 0) & (hour_idx >= 0) & (hour_idx < 24)
+            activity[date_idx[valid] * 24 + hour_idx[valid]] = stats_df['time_spent'].to_numpy()[valid]
+        
+        return pd.DataFrame({
+            'date': dates,
+            'hour': hours,
+            'activity_level': activity,
+            'day_of_week': date_range.weekday.to_numpy().astype(np.int8).repeat(24)
+        })
     
     def get_top_sites_data(self, days: int = 7) -> pd.DataFrame:
         """Get aggregated top sites data."""
@@ -173,8 +229,21 @@ class DataLoader:
         
         return aggregated
     
+    @_cached
     def get_summary_stats(self, days: int = 7) -> Dict[str, Any]:
         """Get summary statistics for the dashboard."""
+        rollup = self.db_manager.get_summary_rollup(days, date.today())
+        if rollup is not None:
+            return {
+                'total_sites': rollup['total_sites'],
+                'total_time': rollup['total_time'],
+                'avg_productivity': round(rollup['avg_productivity'], 2),
+                'active_days': rollup['active_days'],
+                'most_productive_day': rollup['most_productive_day'] or 'N/A',
+                'least_productive_day': rollup['least_productive_day'] or 'N/A'
+            }
+        
+        # No rollup for this window yet, compute it from the entries
         entries_df = self.load_journal_entries(days)
         
         if entries_df.empty:
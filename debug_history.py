@@ -2,12 +2,10 @@
 """
 Debug script to check Firefox history data availability
 """
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent / "src"))
-
 from src.firefox_parser import FirefoxParser
+from src.database import configure_connection
 import sqlite3
+from contextlib import closing
 from datetime import datetime
 
 def debug_firefox_history():
@@ -16,10 +14,15 @@ def debug_firefox_history():
         print(f"Firefox profile found: {parser.profile_path}")
         print(f"Places database exists: {parser.places_db.exists()}")
         
-        # Check database directly
-        temp_db = parser._create_temp_db_copy()
+        # Open the live database read-only instead of copying it; immutable=1
+        # skips locking so this works while Firefox holds the file open
+        places_uri = f"{parser.places_db.resolve().as_uri()}?mode=ro&immutable=1"
         
-        with sqlite3.connect(temp_db) as conn:
+        # The connection's own context manager only ends transactions; closing() releases it
+        with closing(sqlite3.connect(places_uri, uri=True)) as conn:
+            configure_connection(conn, read_only=True)
+            conn.execute("PRAGMA query_only=1")
+            
             cursor = conn.execute("SELECT COUNT(*) FROM moz_historyvisits")
             total_visits = cursor.fetchone()[0]
             print(f"Total history visits in database: {total_visits}")
@@ -39,23 +42,21 @@ def debug_firefox_history():
                     visit_time = datetime.fromtimestamp(row[0] / 1_000_000)
                     print(f"  {visit_time}: {row[1]} - {row[2]}")
                 
-                # Check date range
+                # Check date range; each ORDER BY ... LIMIT 1 is served from
+                # moz_historyvisits_dateindex instead of scanning the table
                 cursor = conn.execute("""
                     SELECT 
-                        MIN(h.visit_date) as earliest,
-                        MAX(h.visit_date) as latest
-                    FROM moz_historyvisits h
+                        (SELECT visit_date FROM moz_historyvisits ORDER BY visit_date ASC LIMIT 1),
+                        (SELECT visit_date FROM moz_historyvisits ORDER BY visit_date DESC LIMIT 1)
                 """)
-                row = cursor.fetchone()
-                if row[0] and row[1]:
-                    earliest = datetime.fromtimestamp(row[0] / 1_000_000)
-                    latest = datetime.fromtimestamp(row[1] / 1_000_000)
+                earliest_ts, latest_ts = cursor.fetchone()
+                if earliest_ts and latest_ts:
+                    earliest = datetime.fromtimestamp(earliest_ts / 1_000_000)
+                    latest = datetime.fromtimestamp(latest_ts / 1_000_000)
                     print(f"\nHistory date range: {earliest.date()} to {latest.date()}")
         
-        temp_db.unlink(missing_ok=True)
-        
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    debug_firefox_history()
\ No newline at end of file
+    debug_firefox_history()
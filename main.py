@@ -6,18 +6,23 @@ Main entry point for the application.
 
 import sys
 import logging
-from datetime import date, datetime
+import functools
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import argparse
+from typing import TYPE_CHECKING
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.config import ConfigManager
-from src.database import DatabaseManager
-from src.journal_generator import JournalGenerator
-from src.markdown_exporter import MarkdownExporter
-from src.scheduler import JournalScheduler
+from src.database import DatabaseManager, JOURNAL_FIELDS
+
+# Generator, exporter and scheduler are imported by the commands that use them,
+# so --help, export and dashboard don't pay for loading them
+if TYPE_CHECKING:
+    from src.journal_generator import JournalGenerator
+    from src.markdown_exporter import MarkdownExporter
 
 def setup_logging(log_level: str = "INFO"):
     """Setup logging configuration."""
@@ -41,22 +46,36 @@ def setup_logging(log_level: str = "INFO"):
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
 
-def generate_journal(args):
-    """Generate journal for a specific date."""
-    config = ConfigManager()
-    db_manager = DatabaseManager(config.database_path)
-    journal_generator = JournalGenerator(db_manager)
-    markdown_exporter = MarkdownExporter(config.journal_output_dir, config.template_path)
-    
-    # Parse target date
-    target_date = date.today()
-    if args.date and args.date != "today":
-        try:
-            target_date = datetime.strptime(args.date, "%Y-%m-%d").date()
-        except ValueError:
-            print(f"Invalid date format: {args.date}. Use YYYY-MM-DD format.")
-            return
-    
+@functools.lru_cache(maxsize=1)
+def get_config() -> ConfigManager:
+    """Return the process-wide configuration, loading it on first use."""
+    return ConfigManager()
+
+@functools.lru_cache(maxsize=1)
+def get_db() -> DatabaseManager:
+    """Return the process-wide database manager."""
+    return DatabaseManager(get_config().database_path)
+
+# Post-generation summary, formatted with one %-operation per journal
+_SUMMARY_FMT = (
+    "\nSummary:\n"
+    "   Sites visited: %(total_sites_visited)d\n"
+    "   Time spent: %(total_time_spent)d minutes\n"
+    "   Productivity score: %(productivity_score)s/10"
+)
+
+def _parse_date(value: str):
+    """Parse a YYYY-MM-DD string or 'today' into a date, or None if invalid."""
+    if not value or value == "today":
+        return date.today()
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        print(f"Invalid date format: {value}. Use YYYY-MM-DD format.")
+        return None
+
+def _generate_for_date(target_date: date, journal_generator: "JournalGenerator", markdown_exporter: "MarkdownExporter"):
+    """Generate and export the journal for one date with already constructed components."""
     print(f"Generating journal for {target_date}...")
     
     # Generate journal data
@@ -70,37 +89,85 @@ def generate_journal(args):
             print(f"[SUCCESS] Journal generated successfully: {output_file}")
             
             # Print summary
-            print(f"\nSummary:")
-            print(f"   Sites visited: {journal_data.get('total_sites_visited', 0)}")
-            print(f"   Time spent: {journal_data.get('total_time_spent', 0)} minutes")
-            print(f"   Productivity score: {journal_data.get('productivity_score', 0)}/10")
+            print(_SUMMARY_FMT % journal_data)
         else:
             print("[ERROR] Failed to export journal to markdown")
     else:
         print("[INFO] No browsing history found for the specified date")
 
+def generate_journal(args):
+    """Generate journal for a specific date."""
+    from src.journal_generator import JournalGenerator
+    from src.markdown_exporter import MarkdownExporter
+    
+    config = get_config()
+    db_manager = get_db()
+    journal_generator = JournalGenerator(db_manager)
+    markdown_exporter = MarkdownExporter(config.journal_output_dir, config.template_path)
+    
+    # Parse target date
+    target_date = _parse_date(args.date)
+    if target_date is None:
+        return
+    
+    _generate_for_date(target_date, journal_generator, markdown_exporter)
+
+def generate_journal_range(args):
+    """Generate journals for every date in a range, fanning days out across processes."""
+    from src.scheduler import JournalScheduler
+    
+    start_date = _parse_date(args.start)
+    end_date = _parse_date(args.end)
+    if start_date is None or end_date is None:
+        return
+    
+    if start_date > end_date:
+        print("[INFO] Start date is after end date, nothing to generate")
+        return
+    
+    print(f"Generating journals from {start_date} to {end_date}...")
+    results = JournalScheduler(get_config()).run_range(start_date, end_date, getattr(args, 'workers', None))
+    
+    for target_date, output_file in results.items():
+        if output_file:
+            print(f"[SUCCESS] {target_date}: {output_file}")
+        else:
+            print(f"[INFO] {target_date}: no journal written")
+    
+    print(f"\n{sum(1 for f in results.values() if f)} of {len(results)} journals generated")
+
 def start_scheduler(args):
     """Start the journal scheduler."""
+    import signal
+    import threading
+    from src.scheduler import JournalScheduler
+    
     print("Starting Firefox History Journal Scheduler...")
     
     scheduler = JournalScheduler()
+    stop_event = threading.Event()
     
-    try:
-        scheduler.start()
-        
-        print("[SUCCESS] Scheduler started successfully")
-        print(f"Next run: {scheduler.get_next_run_time()}")
-        print("Press Ctrl+C to stop")
-        
-        # Keep running
-        import time
-        while True:
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        print("\n[INFO] Stopping scheduler...")
-        scheduler.stop()
-        print("[SUCCESS] Scheduler stopped")
+    # Wake the main thread only when asked to stop
+    def request_stop(signum, frame):
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    scheduler.start()
+    
+    print("[SUCCESS] Scheduler started successfully")
+    print(f"Next run: {scheduler.get_next_run_time()}")
+    print("Press Ctrl+C to stop")
+    
+    # Windows can't interrupt a blocking wait, so poll there; elsewhere park until signalled
+    wait_timeout = 1.0 if sys.platform == "win32" else None
+    while not stop_event.wait(wait_timeout):
+        pass
+    
+    print("\n[INFO] Stopping scheduler...")
+    scheduler.stop()
+    print("[SUCCESS] Scheduler stopped")
 
 def start_dashboard(args):
     """Start the dashboard - try Streamlit first, fallback to simple HTML dashboard."""
@@ -127,25 +194,19 @@ def start_dashboard(args):
         print(f"[INFO] Streamlit not available, using simple HTML dashboard instead")
         print(f"To install Streamlit: uv add streamlit")
         
-        # Fallback to simple HTML dashboard
+        # Fallback to simple HTML dashboard, generated in this process
         try:
-            simple_dashboard_path = Path(__file__).parent / "simple_dashboard.py"
-            result = subprocess.run([
-                sys.executable, str(simple_dashboard_path)
-            ], capture_output=True, text=True, check=True)
-            
-            print(result.stdout)
-            if result.stderr:
-                print(f"Warnings: {result.stderr}")
+            import simple_dashboard
+            simple_dashboard.main()
                 
         except Exception as fallback_error:
+            logging.getLogger(__name__).exception("HTML dashboard fallback failed")
             print(f"[ERROR] Failed to generate HTML dashboard: {fallback_error}")
             print("Try running manually: uv run python simple_dashboard.py")
 
 def export_data(args):
     """Export journal data to various formats."""
-    config = ConfigManager()
-    db_manager = DatabaseManager(config.database_path)
+    db_manager = get_db()
     
     # Parse date range
     try:
@@ -156,34 +217,55 @@ def export_data(args):
         else:
             # Default to last 30 days
             end_date = date.today()
-            start_date = end_date - datetime.timedelta(days=30)
+            start_date = end_date - timedelta(days=30)
     except ValueError:
         print("Invalid date range format. Use 'YYYY-MM-DD,YYYY-MM-DD'")
         return
     
     print(f"Exporting data from {start_date} to {end_date}...")
     
-    # Get journal entries
-    entries = db_manager.get_journal_entries_range(start_date, end_date)
-    
-    if not entries:
-        print("[INFO] No data found for the specified date range")
-        return
-    
-    # Export based on format
+    # Export based on format, streaming one entry at a time
     output_file = f"export_{start_date}_to_{end_date}.{args.format}"
+    entries = db_manager.iter_journal_entries_range(start_date, end_date)
+    exported = 0
     
     if args.format == "json":
-        import json
-        with open(output_file, 'w') as f:
-            json.dump(entries, f, indent=2, default=str)
-    elif args.format == "csv":
-        import csv
-        with open(output_file, 'w', newline='') as f:
-            if entries:
-                writer = csv.DictWriter(f, fieldnames=entries[0].keys())
+        try:
+            import orjson
+            def dumps(entry):
+                return orjson.dumps(entry, option=orjson.OPT_INDENT_2, default=str)
+        except ImportError:
+            import json
+            def dumps(entry):
+                return json.dumps(entry, indent=2, default=str).encode('utf-8')
+    
+    try:
+        if args.format == "json":
+            with open(output_file, 'wb') as f:
+                f.write(b"[")
+                for entry in entries:
+                    f.write(b",\n" if exported else b"\n")
+                    f.write(dumps(entry))
+                    exported += 1
+                f.write(b"\n]")
+        elif args.format == "csv":
+            import csv
+            with open(output_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=JOURNAL_FIELDS)
                 writer.writeheader()
-                writer.writerows(entries)
+                for entry in entries:
+                    writer.writerow(entry)
+                    exported += 1
+    except Exception as e:
+        # Don't leave a truncated export behind
+        Path(output_file).unlink(missing_ok=True)
+        print(f"[ERROR] Export failed: {e}")
+        return
+    
+    if not exported:
+        Path(output_file).unlink(missing_ok=True)
+        print("[INFO] No data found for the specified date range")
+        return
     
     print(f"[SUCCESS] Data exported to {output_file}")
 
@@ -197,20 +279,31 @@ def main():
     # Generate command
     generate_parser = subparsers.add_parser("generate", help="Generate journal for a specific date")
     generate_parser.add_argument("--date", default="today", help="Date in YYYY-MM-DD format or 'today'")
+    generate_parser.set_defaults(func=generate_journal)
+    
+    # Generate range command
+    generate_range_parser = subparsers.add_parser("generate-range", help="Generate journals for every date in a range")
+    generate_range_parser.add_argument("--start", required=True, help="First date in YYYY-MM-DD format")
+    generate_range_parser.add_argument("--end", default="today", help="Last date in YYYY-MM-DD format or 'today'")
+    generate_range_parser.add_argument("--workers", type=int, help="Worker processes (defaults to the CPU count)")
+    generate_range_parser.set_defaults(func=generate_journal_range)
     
     # Schedule command
     schedule_parser = subparsers.add_parser("schedule", help="Start the journal scheduler")
     schedule_parser.add_argument("--start", action="store_true", help="Start the scheduler daemon")
+    schedule_parser.set_defaults(func=start_scheduler)
     
     # Dashboard command
     dashboard_parser = subparsers.add_parser("dashboard", help="Start the web dashboard")
     dashboard_parser.add_argument("--host", default="localhost", help="Host to bind to")
     dashboard_parser.add_argument("--port", type=int, default=8765, help="Port to bind to")
+    dashboard_parser.set_defaults(func=start_dashboard)
     
     # Export command
     export_parser = subparsers.add_parser("export", help="Export journal data")
     export_parser.add_argument("--format", choices=["json", "csv"], default="json", help="Export format")
     export_parser.add_argument("--date-range", help="Date range in 'YYYY-MM-DD,YYYY-MM-DD' format")
+    export_parser.set_defaults(func=export_data)
     
     args = parser.parse_args()
     
@@ -218,14 +311,8 @@ def main():
     setup_logging(args.log_level)
     
     # Execute command
-    if args.command == "generate":
-        generate_journal(args)
-    elif args.command == "schedule":
-        start_scheduler(args)
-    elif args.command == "dashboard":
-        start_dashboard(args)
-    elif args.command == "export":
-        export_data(args)
+    if hasattr(args, 'func'):
+        args.func(args)
     else:
         parser.print_help()
 
@@ -1,14 +1,46 @@
-import json
 import logging
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+if hasattr(_json, 'OPT_INDENT_2'):
+    def _dumps(config: Dict[str, Any]) -> bytes:
+        """Serialize the configuration to indented JSON bytes with orjson."""
+        return _json.dumps(config, option=_json.OPT_INDENT_2)
+else:
+    def _dumps(config: Dict[str, Any]) -> bytes:
+        """Serialize the configuration to indented JSON bytes."""
+        return _json.dumps(config, indent=2).encode('utf-8')
+
+# Sentinel telling a missing key apart from one set to None
+_MISSING = object()
+
+# Values get() hands out that callers can't mutate in place
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def _flatten(config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Index every value of a nested config dict by its dotted path, sections included."""
+    flat = {}
+    for key, value in config.items():
+        path = prefix + key
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+    return flat
+
 class ConfigManager:
     def __init__(self, config_path: str = "config.json"):
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self._flat = _flatten(self.config)
+        self._mtime = self._file_mtime()
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration."""
@@ -46,8 +78,7 @@ class ConfigManager:
         """Load configuration from file or create default."""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = _json.loads(self.config_path.read_bytes())
                 logger.info(f"Configuration loaded from {self.config_path}")
                 return config
             else:
@@ -63,29 +94,33 @@ class ConfigManager:
     def _save_config(self, config: Dict[str, Any]) -> bool:
         """Save configuration to file."""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
+            self.config_path.write_bytes(_dumps(config))
+            self._mtime = self._file_mtime()
             logger.info(f"Configuration saved to {self.config_path}")
             return True
         except Exception as e:
             logger.error(f"Error saving configuration: {e}")
             return False
     
+    def _reindex(self):
+        """Rebuild the dotted-path index and drop memoized convenience values."""
+        self._flat = _flatten(self.config)
+        for name, attr in vars(ConfigManager).items():
+            if isinstance(attr, cached_property):
+                self.__dict__.pop(name, None)
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'firefox.profile_path')."""
-        keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     def set(self, key: str, value: Any) -> bool:
         """Set configuration value using dot notation."""
+        # Nothing to write when the key already holds this scalar; lists and dicts
+        # from get() are the live objects, so an in-place edit would compare equal
+        current = self._flat.get(key, _MISSING)
+        if isinstance(value, _SCALAR_TYPES) and type(current) is type(value) and current == value:
+            return True
+        
         keys = key.split('.')
         config = self.config
         
@@ -97,13 +132,27 @@ class ConfigManager:
         
         # Set the value
         config[keys[-1]] = value
+        self._reindex()
         
         # Save the updated configuration
         return self._save_config(self.config)
     
+    def _file_mtime(self) -> Optional[int]:
+        """Return the config file's modification time in nanoseconds, or None if it is missing."""
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+    
     def reload(self) -> Dict[str, Any]:
-        """Reload configuration from file."""
+        """Reload configuration from file if it changed since it was last read or written."""
+        mtime = self._file_mtime()
+        if mtime is not None and mtime == self._mtime:
+            return self.config
+        
         self.config = self._load_config()
+        self._reindex()
+        self._mtime = self._file_mtime()
         return self.config
     
     def validate(self) -> bool:
@@ -131,58 +180,58 @@ class ConfigManager:
         return True
     
     # Convenience methods for common config access
-    @property
+    @cached_property
     def firefox_profile_path(self) -> Optional[str]:
         """Get Firefox profile path."""
         path = self.get('firefox.profile_path')
         return None if path == 'auto' else path
     
-    @property
+    @cached_property
     def exclude_private_browsing(self) -> bool:
         """Check if private browsing should be excluded."""
         return self.get('firefox.exclude_private', True)
     
-    @property
-    def excluded_domains(self) -> list:
-        """Get list of excluded domains."""
-        return self.get('firefox.excluded_domains', [])
+    @cached_property
+    def excluded_domains(self) -> frozenset:
+        """Get the set of excluded domains, lowercased for direct membership checks."""
+        return frozenset(domain.strip().lower() for domain in self.get('firefox.excluded_domains', ()))
     
-    @property
+    @cached_property
     def journal_output_dir(self) -> str:
         """Get journal output directory."""
         return self.get('journal.output_directory', './journals')
     
-    @property
+    @cached_property
     def template_path(self) -> str:
         """Get template path."""
         return self.get('journal.template_path', './templates/daily_template.md')
     
-    @property
+    @cached_property
     def database_path(self) -> str:
         """Get database path."""
         return self.get('database.path', './data/journal.db')
     
-    @property
+    @cached_property
     def scheduler_enabled(self) -> bool:
         """Check if scheduler is enabled."""
         return self.get('scheduler.enabled', True)
     
-    @property
+    @cached_property
     def scheduler_time(self) -> str:
         """Get scheduler time."""
         return self.get('scheduler.time', '23:30')
     
-    @property
+    @cached_property
     def dashboard_host(self) -> str:
         """Get dashboard host."""
         return self.get('dashboard.host', 'localhost')
     
-    @property
+    @cached_property
     def dashboard_port(self) -> int:
         """Get dashboard port."""
         return self.get('dashboard.port', 8765)
     
-    @property
+    @cached_property
     def dashboard_theme(self) -> str:
         """Get dashboard theme."""
         return self.get('dashboard.theme', 'light')
\ No newline at end of file
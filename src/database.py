@@ -1,21 +1,211 @@
 import sqlite3
-import json
-from datetime import date, datetime
+import threading
+import weakref
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, NamedTuple
 import logging
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+if hasattr(_json, 'OPT_NON_STR_KEYS'):
+    def _dumps(obj: Any) -> str:
+        """Serialize to a JSON string with orjson; int keys (hourly stats) are stringified like json does."""
+        return _json.dumps(obj, option=_json.OPT_NON_STR_KEYS).decode()
+else:
+    _dumps = _json.dumps
+
+_loads = _json.loads
+
+def _loads_or(text: Optional[str], empty: type) -> Any:
+    """Decode a JSON column, building a fresh empty container without the parser for blank values."""
+    if not text or text == '[]' or text == '{}':
+        return empty()
+    return _loads(text)
+
+class _LazyJSON(Mapping):
+    """Read-only mapping over a JSON object column that is only decoded on first access."""
+    __slots__ = ('_text', '_value')
+    
+    def __init__(self, text: Optional[str]):
+        self._text = text
+        self._value = None
+    
+    def resolve(self) -> Dict[str, Any]:
+        """Decode the JSON text once and return the resulting dict."""
+        if self._value is None:
+            self._value = _loads_or(self._text, dict)
+        return self._value
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.resolve()[key]
+    
+    def __iter__(self):
+        return iter(self.resolve())
+    
+    def __len__(self) -> int:
+        return len(self.resolve())
+    
+    def __repr__(self) -> str:
+        return f"_LazyJSON({self.resolve()!r})"
+
+class JournalRow(NamedTuple):
+    """Compact journal entry row returned for date range queries."""
+    id: int
+    date: date
+    total_sites_visited: int
+    total_time_spent: int
+    top_categories: List[Dict[str, Any]]
+    productivity_score: float
+    summary: str
+    raw_data: Mapping
+    created_at: str
+
+# Keys of the dicts returned for journal entries, in column order
+JOURNAL_FIELDS = JournalRow._fields
+
+# Journal entry columns; the "date [DATE]" alias makes sqlite3 hand back date objects
+JOURNAL_SELECT = """
+    SELECT id, date AS "date [DATE]", total_sites_visited, total_time_spent, top_categories,
+           productivity_score, summary, raw_data, created_at
+    FROM journal_entries
+"""
+
+# Statements built once so each call hands sqlite3's statement cache the same string
+JOURNAL_BY_DATE_SQL = JOURNAL_SELECT + "WHERE date = ?"
+JOURNAL_RANGE_SQL = JOURNAL_SELECT + "WHERE date BETWEEN ? AND ? ORDER BY date"
+JOURNAL_RANGE_DESC_SQL = JOURNAL_RANGE_SQL + " DESC"
+SITE_CATEGORIES_SQL = "SELECT domain, category, productivity_weight FROM site_categories"
+SITE_CATEGORIES_BY_DOMAIN_SQL = SITE_CATEGORIES_SQL + " ORDER BY domain"
+DAILY_STATS_SQL = "SELECT hour, sites_visited, time_spent FROM daily_stats WHERE date = ?"
+DAILY_STATS_RANGE_SQL = """
+    SELECT date AS "date [DATE]", hour, sites_visited, time_spent
+    FROM daily_stats WHERE date BETWEEN ? AND ?
+"""
+
+# Rows fetched per lock acquisition by iter_journal_entries_range
+_ITER_BATCH_SIZE = 256
+
+# Parse DATE-tagged columns in C-level row conversion instead of per-row Python code
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+# Site categories seeded into a new database
+DEFAULT_CATEGORIES = (
+    ("github.com", "Development", 0.8),
+    ("stackoverflow.com", "Development", 0.7),
+    ("docs.python.org", "Development", 0.8),
+    ("youtube.com", "Entertainment", -0.3),
+    ("facebook.com", "Social Media", -0.2),
+    ("twitter.com", "Social Media", -0.2),
+    ("linkedin.com", "Professional", 0.4),
+    ("medium.com", "Reading", 0.5),
+    ("reddit.com", "Social Media", -0.1),
+    ("wikipedia.org", "Research", 0.6),
+    ("google.com", "Search", 0.1),
+)
+
+# Day windows whose summary cards are precomputed on every journal write
+SUMMARY_WINDOWS = (7, 30, 90)
+
+def configure_connection(conn: sqlite3.Connection, read_only: bool = False):
+    """Tune a connection for read-heavy use: in-memory temp tables, mmap I/O and a 64 MiB cache."""
+    # WAL needs write access, so read-only databases (e.g. Firefox's places.sqlite) keep their mode
+    if not read_only:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+
+def _je_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Build a journal entry dict with decoded JSON fields straight from a raw row."""
+    return {
+        'id': row[0],
+        'date': row[1],
+        'total_sites_visited': row[2],
+        'total_time_spent': row[3],
+        'top_categories': _loads_or(row[4], list),
+        'productivity_score': row[5],
+        'summary': row[6],
+        'raw_data': _loads_or(row[7], dict),
+        'created_at': row[8]
+    }
+
+def _journal_row_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> JournalRow:
+    """Build a JournalRow from a raw row, leaving raw_data to be decoded on access."""
+    entry_id, entry_date, sites, time_spent, top_categories, productivity_score, summary, raw_data, created_at = row
+    return JournalRow(
+        entry_id, entry_date, sites, time_spent, _loads_or(top_categories, list),
+        productivity_score, summary, _LazyJSON(raw_data), created_at
+    )
+
+def _execute_with(conn: sqlite3.Connection, sql: str, params: Tuple[Any, ...], row_factory: Optional[Any] = None) -> sqlite3.Cursor:
+    """Execute a query on a cursor with its own row factory; None yields plain tuples instead of sqlite3.Row."""
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    return cursor.execute(sql, params)
+
 class DatabaseManager:
     def __init__(self, db_path: str = "./data/journal.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        
+        # One connection for the lifetime of the manager, shared across threads
+        self._lock = threading.RLock()
+        self._in_batch = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, detect_types=sqlite3.PARSE_COLNAMES)
+        self._conn.row_factory = sqlite3.Row
+        configure_connection(self._conn)
+        # Closes the connection when the manager is collected or, failing that, at exit;
+        # unlike atexit.register it holds no reference to the manager itself
+        self._finalizer = weakref.finalize(self, self._conn.close)
+        
+        # domain -> category row, loaded on first lookup
+        self._category_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        
         self.init_database()
     
+    @contextmanager
+    def connection(self):
+        """Yield the shared connection under the lock, committing on success unless inside batch()."""
+        with self._lock:
+            if self._in_batch:
+                yield self._conn
+            else:
+                with self._conn:
+                    yield self._conn
+    
+    @contextmanager
+    def batch(self):
+        """Run several writes in one transaction, committed on exit and rolled back on error."""
+        with self._lock:
+            if self._in_batch:
+                yield
+                return
+            
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._in_batch = True
+                try:
+                    yield
+                finally:
+                    self._in_batch = False
+    
+    def close(self):
+        """Close the shared database connection."""
+        with self._lock:
+            self._finalizer()
+    
     def init_database(self):
         """Initialize the database with required tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connection() as conn:
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS journal_entries (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -45,39 +235,44 @@ class DatabaseManager:
                     UNIQUE(date, hour)
                 );
                 
+                CREATE TABLE IF NOT EXISTS summary_rollup (
+                    window_days INTEGER NOT NULL,
+                    as_of_date DATE NOT NULL,
+                    total_sites INTEGER,
+                    total_time INTEGER,
+                    avg_productivity REAL,
+                    active_days INTEGER,
+                    most_productive_day DATE,
+                    least_productive_day DATE,
+                    PRIMARY KEY (window_days, as_of_date)
+                );
+                
                 CREATE INDEX IF NOT EXISTS idx_journal_date ON journal_entries(date);
-                CREATE INDEX IF NOT EXISTS idx_daily_stats_date ON daily_stats(date);
+                DROP INDEX IF EXISTS idx_daily_stats_date;
+                CREATE INDEX IF NOT EXISTS idx_daily_stats_covering
+                    ON daily_stats(date, hour, sites_visited, time_spent);
             """)
         
         # Insert default site categories
         self._insert_default_categories()
     
     def _insert_default_categories(self):
-        """Insert default site categories with productivity weights."""
-        default_categories = [
-            ("github.com", "Development", 0.8),
-            ("stackoverflow.com", "Development", 0.7),
-            ("docs.python.org", "Development", 0.8),
-            ("youtube.com", "Entertainment", -0.3),
-            ("facebook.com", "Social Media", -0.2),
-            ("twitter.com", "Social Media", -0.2),
-            ("linkedin.com", "Professional", 0.4),
-            ("medium.com", "Reading", 0.5),
-            ("reddit.com", "Social Media", -0.1),
-            ("wikipedia.org", "Research", 0.6),
-            ("google.com", "Search", 0.1),
-        ]
-        
-        with sqlite3.connect(self.db_path) as conn:
+        """Insert default site categories with productivity weights, once per database."""
+        with self.connection() as conn:
+            # user_version records that the defaults were seeded, so later opens skip the inserts
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+                return
+            
             conn.executemany(
                 "INSERT OR IGNORE INTO site_categories (domain, category, productivity_weight) VALUES (?, ?, ?)",
-                default_categories
+                DEFAULT_CATEGORIES
             )
+            conn.execute("PRAGMA user_version = 1")
     
     def save_journal_entry(self, entry_date: date, data: Dict[str, Any]) -> bool:
         """Save a journal entry for a specific date."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connection() as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO journal_entries 
                     (date, total_sites_visited, total_time_spent, top_categories, 
@@ -87,153 +282,320 @@ class DatabaseManager:
                     entry_date.isoformat(),
                     data.get('total_sites_visited', 0),
                     data.get('total_time_spent', 0),
-                    json.dumps(data.get('top_categories', [])),
+                    _dumps(data.get('top_categories', [])),
                     data.get('productivity_score', 0.0),
                     data.get('summary', ''),
-                    json.dumps(data.get('raw_data', {}))
+                    _dumps(data.get('raw_data', {}))
                 ))
+                self._refresh_summary_rollup(conn, date.today())
             return True
         except Exception as e:
             logger.error(f"Error saving journal entry: {e}")
             return False
     
-    def get_journal_entry(self, entry_date: date) -> Optional[Dict[str, Any]]:
-        """Retrieve a journal entry for a specific date."""
+    def _refresh_summary_rollup(self, conn: sqlite3.Connection, as_of_date: date):
+        """Recompute the summary rollup rows ending at as_of_date inside the caller's transaction."""
+        end = as_of_date.isoformat()
+        for window_days in SUMMARY_WINDOWS:
+            start = (as_of_date - timedelta(days=window_days)).isoformat()
+            conn.execute("""
+                INSERT OR REPLACE INTO summary_rollup 
+                (window_days, as_of_date, total_sites, total_time, avg_productivity, 
+                 active_days, most_productive_day, least_productive_day)
+                SELECT ?, ?,
+                       COALESCE(SUM(total_sites_visited), 0),
+                       COALESCE(SUM(total_time_spent), 0),
+                       COALESCE(AVG(productivity_score), 0.0),
+                       COUNT(*),
+                       (SELECT date FROM journal_entries WHERE date BETWEEN ? AND ?
+                        ORDER BY productivity_score DESC, date LIMIT 1),
+                       (SELECT date FROM journal_entries WHERE date BETWEEN ? AND ?
+                        ORDER BY productivity_score ASC, date LIMIT 1)
+                FROM journal_entries
+                WHERE date BETWEEN ? AND ?
+            """, (window_days, end, start, end, start, end, start, end))
+    
+    def get_summary_rollup(self, window_days: int, as_of_date: date) -> Optional[Dict[str, Any]]:
+        """Retrieve precomputed summary statistics for a day window, if present."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    "SELECT * FROM journal_entries WHERE date = ?",
-                    (entry_date.isoformat(),)
-                )
+            with self.connection() as conn:
+                cursor = conn.execute("""
+                    SELECT total_sites, total_time, avg_productivity, active_days,
+                           most_productive_day, least_productive_day
+                    FROM summary_rollup WHERE window_days = ? AND as_of_date = ?
+                """, (window_days, as_of_date.isoformat()))
                 row = cursor.fetchone()
                 
                 if row:
-                    return {
-                        'id': row['id'],
-                        'date': row['date'],
-                        'total_sites_visited': row['total_sites_visited'],
-                        'total_time_spent': row['total_time_spent'],
-                        'top_categories': json.loads(row['top_categories'] or '[]'),
-                        'productivity_score': row['productivity_score'],
-                        'summary': row['summary'],
-                        'raw_data': json.loads(row['raw_data'] or '{}'),
-                        'created_at': row['created_at']
-                    }
+                    return dict(row)
+        except Exception as e:
+            logger.error(f"Error retrieving summary rollup: {e}")
+        return None
+    
+    def has_any_entries(self) -> bool:
+        """Check whether at least one journal entry exists."""
+        try:
+            with self.connection() as conn:
+                cursor = conn.execute("SELECT EXISTS(SELECT 1 FROM journal_entries)")
+                return bool(cursor.fetchone()[0])
+        except Exception as e:
+            logger.error(f"Error checking for journal entries: {e}")
+        return False
+    
+    def get_journal_entry(self, entry_date: date) -> Optional[Dict[str, Any]]:
+        """Retrieve a journal entry for a specific date."""
+        try:
+            with self.connection() as conn:
+                cursor = _execute_with(conn, JOURNAL_BY_DATE_SQL, (entry_date.isoformat(),), _je_factory)
+                return cursor.fetchone()
         except Exception as e:
             logger.error(f"Error retrieving journal entry: {e}")
         return None
     
-    def get_journal_entries_range(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
-        """Retrieve journal entries within a date range."""
+    def get_journal_entries_range(self, start_date: date, end_date: date, newest_first: bool = False) -> List[JournalRow]:
+        """Retrieve journal entries within a date range, oldest first unless newest_first is set."""
+        sql = JOURNAL_RANGE_DESC_SQL if newest_first else JOURNAL_RANGE_SQL
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    "SELECT * FROM journal_entries WHERE date BETWEEN ? AND ? ORDER BY date",
-                    (start_date.isoformat(), end_date.isoformat())
+            with self.connection() as conn:
+                cursor = _execute_with(
+                    conn, sql, (start_date.isoformat(), end_date.isoformat()), _journal_row_factory
                 )
-                
-                entries = []
-                for row in cursor.fetchall():
-                    entries.append({
-                        'id': row['id'],
-                        'date': row['date'],
-                        'total_sites_visited': row['total_sites_visited'],
-                        'total_time_spent': row['total_time_spent'],
-                        'top_categories': json.loads(row['top_categories'] or '[]'),
-                        'productivity_score': row['productivity_score'],
-                        'summary': row['summary'],
-                        'raw_data': json.loads(row['raw_data'] or '{}'),
-                        'created_at': row['created_at']
-                    })
-                return entries
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Error retrieving journal entries range: {e}")
         return []
     
+    def get_weekly_summary(self, start_date: date, end_date: date) -> Tuple[int, int, float, int]:
+        """Aggregate total sites, total time, average productivity and day count over a date range."""
+        try:
+            with self.connection() as conn:
+                cursor = conn.execute("""
+                    SELECT COALESCE(SUM(total_sites_visited), 0),
+                           COALESCE(SUM(total_time_spent), 0),
+                           COALESCE(AVG(productivity_score), 0.0),
+                           COUNT(*)
+                    FROM journal_entries WHERE date BETWEEN ? AND ?
+                """, (start_date.isoformat(), end_date.isoformat()))
+                return tuple(cursor.fetchone())
+        except Exception as e:
+            logger.error(f"Error retrieving weekly summary: {e}")
+        return (0, 0, 0.0, 0)
+    
+    def get_entries_fingerprint(self, since_date: date) -> Optional[Tuple[Any, ...]]:
+        """Return a tuple that changes whenever journal entries on or after a date change."""
+        try:
+            with self.connection() as conn:
+                # INSERT OR REPLACE re-inserts the row, so a rewrite bumps both id and created_at
+                cursor = conn.execute(
+                    "SELECT MAX(created_at), MAX(id), COUNT(*) FROM journal_entries WHERE date >= ?",
+                    (since_date.isoformat(),)
+                )
+                return tuple(cursor.fetchone())
+        except Exception as e:
+            logger.error(f"Error retrieving entries fingerprint: {e}")
+        return None
+    
+    def get_date_bounds(self) -> Tuple[Optional[date], Optional[date]]:
+        """Return the earliest and latest journal entry dates, or (None, None) when there are no entries."""
+        try:
+            with self.connection() as conn:
+                # Separate subqueries let SQLite answer each from one end of the date index instead of scanning it
+                cursor = conn.execute("""
+                    SELECT (SELECT MIN(date) FROM journal_entries) AS "first [DATE]",
+                           (SELECT MAX(date) FROM journal_entries) AS "last [DATE]"
+                """)
+                return tuple(cursor.fetchone())
+        except Exception as e:
+            logger.error(f"Error retrieving journal date bounds: {e}")
+        return (None, None)
+    
+    def iter_journal_entries_range(self, start_date: date, end_date: date) -> Iterator[Dict[str, Any]]:
+        """Yield journal entries within a date range in batches, without loading them all."""
+        try:
+            # The lock is held only while fetching, so other threads can use the connection between batches
+            with self._lock:
+                cursor = _execute_with(
+                    self._conn, JOURNAL_RANGE_SQL, (start_date.isoformat(), end_date.isoformat()), _je_factory
+                )
+                rows = cursor.fetchmany(_ITER_BATCH_SIZE)
+            try:
+                while rows:
+                    yield from rows
+                    with self._lock:
+                        rows = cursor.fetchmany(_ITER_BATCH_SIZE)
+            finally:
+                with self._lock:
+                    cursor.close()
+        except Exception as e:
+            # A partial result must not pass for a complete one
+            logger.error(f"Error iterating journal entries range: {e}")
+            raise
+    
+    def top_sites_for(self, entry_date: date, k: int = 8) -> List[Dict[str, Any]]:
+        """Return the k domains with the most time spent on a date, sorted inside SQLite."""
+        try:
+            with self.connection() as conn:
+                cursor = conn.execute("""
+                    SELECT s.key AS domain,
+                           COALESCE(json_extract(s.value, '$.time_spent'), 0) AS time_spent,
+                           COALESCE(json_extract(s.value, '$.visits'), 0) AS visits,
+                           COALESCE(json_extract(s.value, '$.category'), 'Uncategorized') AS category
+                    FROM journal_entries, json_each(journal_entries.raw_data, '$.domain_stats') AS s
+                    WHERE journal_entries.date = ?
+                    ORDER BY time_spent DESC, s.id
+                    LIMIT ?
+                """, (entry_date.isoformat(), k))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error retrieving top sites: {e}")
+        return []
+    
+    def get_category_totals(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Sum time spent and visits per category across journal entries in a date range."""
+        try:
+            with self.connection() as conn:
+                # Ties keep the order in which categories first appear across the range
+                cursor = conn.execute("""
+                    SELECT json_extract(c.value, '$.category') AS category,
+                           SUM(json_extract(c.value, '$.time_spent')) AS time_spent,
+                           SUM(json_extract(c.value, '$.visits')) AS visits
+                    FROM journal_entries, json_each(journal_entries.top_categories) AS c
+                    WHERE journal_entries.date BETWEEN ? AND ?
+                    GROUP BY category
+                    ORDER BY time_spent DESC, MIN(journal_entries.date), MIN(c.key)
+                """, (start_date.isoformat(), end_date.isoformat()))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error retrieving category totals: {e}")
+        return []
+    
     def save_daily_stats(self, entry_date: date, hourly_stats: Dict[int, Dict[str, int]]):
         """Save hourly statistics for a day."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Clear existing stats for the date
-                conn.execute("DELETE FROM daily_stats WHERE date = ?", (entry_date.isoformat(),))
+            day = entry_date.isoformat()
+            rows = [
+                (day, hour, stats.get('sites_visited', 0), stats.get('time_spent', 0))
+                for hour, stats in hourly_stats.items()
+            ]
+            
+            with self.connection() as conn:
+                # Take the write lock up front rather than upgrading a deferred transaction,
+                # unless an enclosing batch() already holds it
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
                 
-                # Insert new stats
-                for hour, stats in hourly_stats.items():
-                    conn.execute("""
-                        INSERT INTO daily_stats (date, hour, sites_visited, time_spent)
-                        VALUES (?, ?, ?, ?)
-                    """, (
-                        entry_date.isoformat(),
-                        hour,
-                        stats.get('sites_visited', 0),
-                        stats.get('time_spent', 0)
-                    ))
+                # Replace the day's stats in one statement batch
+                conn.execute("DELETE FROM daily_stats WHERE date = ?", (day,))
+                conn.executemany("""
+                    INSERT INTO daily_stats (date, hour, sites_visited, time_spent)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
         except Exception as e:
             logger.error(f"Error saving daily stats: {e}")
     
     def get_daily_stats(self, entry_date: date) -> Dict[int, Dict[str, int]]:
         """Retrieve hourly statistics for a day."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT hour, sites_visited, time_spent FROM daily_stats WHERE date = ?",
-                    (entry_date.isoformat(),)
-                )
-                
-                stats = {}
-                for row in cursor.fetchall():
-                    hour, sites_visited, time_spent = row
-                    stats[hour] = {
-                        'sites_visited': sites_visited,
-                        'time_spent': time_spent
-                    }
-                return stats
+            with self.connection() as conn:
+                cursor = _execute_with(conn, DAILY_STATS_SQL, (entry_date.isoformat(),))
+                return {
+                    hour: {'sites_visited': sites_visited, 'time_spent': time_spent}
+                    for hour, sites_visited, time_spent in cursor.fetchall()
+                }
         except Exception as e:
             logger.error(f"Error retrieving daily stats: {e}")
         return {}
     
-    def get_site_category(self, domain: str) -> Optional[Dict[str, Any]]:
-        """Get category information for a domain."""
+    def get_daily_stats_range(self, start_date: date, end_date: date) -> Dict[date, Dict[int, Dict[str, int]]]:
+        """Retrieve hourly statistics for every day within a date range, grouped by day."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.connection() as conn:
+                cursor = conn.execute(DAILY_STATS_RANGE_SQL, (start_date.isoformat(), end_date.isoformat()))
+                stats_by_day = {}
+                for day, hour, sites_visited, time_spent in cursor:
+                    try:
+                        day_stats = stats_by_day[day]
+                    except KeyError:
+                        day_stats = stats_by_day[day] = {}
+                    day_stats[hour] = {'sites_visited': sites_visited, 'time_spent': time_spent}
+                return stats_by_day
+        except Exception as e:
+            logger.error(f"Error retrieving daily stats range: {e}")
+        return {}
+    
+    def get_hourly_stats_range(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Retrieve hourly statistics for every day within a date range."""
+        try:
+            with self.connection() as conn:
                 cursor = conn.execute(
-                    "SELECT * FROM site_categories WHERE domain = ?",
-                    (domain,)
+                    "SELECT date, hour, sites_visited, time_spent FROM daily_stats WHERE date BETWEEN ? AND ?",
+                    (start_date.isoformat(), end_date.isoformat())
                 )
-                row = cursor.fetchone()
-                
-                if row:
-                    return {
-                        'domain': row['domain'],
-                        'category': row['category'],
-                        'productivity_weight': row['productivity_weight']
-                    }
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error retrieving hourly stats range: {e}")
+        return []
+    
+    def reload_categories(self) -> Dict[str, Dict[str, Any]]:
+        """Reload the in-memory site category cache from the database."""
+        with self.connection() as conn:
+            cursor = conn.execute(SITE_CATEGORIES_SQL)
+            self._category_cache = {row['domain']: dict(row) for row in cursor}
+        return self._category_cache
+    
+    def _categories(self) -> Dict[str, Dict[str, Any]]:
+        """Return the site category cache, loading it on first use."""
+        categories = self._category_cache
+        if categories is None:
+            categories = self.reload_categories()
+        return categories
+    
+    def get_site_category(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Get category information for a domain."""
+        try:
+            return self._categories().get(domain)
         except Exception as e:
             logger.error(f"Error retrieving site category: {e}")
         return None
     
+    def get_site_categories(self, domains: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get category information for several domains at once, keyed by domain; unknown domains are omitted."""
+        try:
+            categories = self._categories()
+            return {domain: categories[domain] for domain in domains if domain in categories}
+        except Exception as e:
+            logger.error(f"Error retrieving site categories: {e}")
+        return {}
+    
     def add_site_category(self, domain: str, category: str, productivity_weight: float = 0.0) -> bool:
         """Add or update a site category."""
+        return self.add_site_categories([(domain, category, productivity_weight)])
+    
+    def add_site_categories(self, rows: List[Tuple[str, str, float]]) -> bool:
+        """Add or update several (domain, category, productivity_weight) rows in one transaction."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self.connection() as conn:
+                conn.executemany("""
                     INSERT OR REPLACE INTO site_categories (domain, category, productivity_weight)
                     VALUES (?, ?, ?)
-                """, (domain, category, productivity_weight))
+                """, rows)
+            if self._category_cache is not None:
+                for domain, category, productivity_weight in rows:
+                    self._category_cache[domain] = {
+                        'domain': domain,
+                        'category': category,
+                        'productivity_weight': productivity_weight
+                    }
             return True
         except Exception as e:
-            logger.error(f"Error adding site category: {e}")
+            logger.error(f"Error adding site categories: {e}")
             return False
     
     def get_all_categories(self) -> List[Dict[str, Any]]:
         """Get all site categories."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("SELECT * FROM site_categories ORDER BY domain")
+            with self.connection() as conn:
+                cursor = conn.execute(SITE_CATEGORIES_BY_DOMAIN_SQL)
                 
                 categories = []
                 for row in cursor.fetchall():
@@ -1,14 +1,200 @@
+import re
 import sqlite3
 import os
+import functools
+import threading
+import weakref
 import platform
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime, date
-from urllib.parse import urlparse
+from typing import List, Dict, Iterator, Optional, Tuple
+from datetime import datetime, date, timedelta, timezone
 import logging
+from contextlib import contextmanager
+
+from .database import configure_connection
 
 logger = logging.getLogger(__name__)
 
+# Network location of a URL: everything between "scheme://" and the first '/', '?' or '#'
+_HOST_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*://([^/?#]*)', re.ASCII)
+
+@functools.lru_cache(maxsize=65536)
+def _extract_host(url: Optional[str]) -> str:
+    """Return the lowercased network location of a URL without a leading 'www.'."""
+    match = _HOST_RE.match(url) if url else None
+    if not match:
+        return ''
+    domain = match.group(1).lower()
+    return domain[4:] if domain.startswith('www.') else domain
+
+# Visits in a timestamp range with their host; the third parameter enables the private-visit filter
+HISTORY_SQL = """
+    SELECT 
+        p.url,
+        p.title,
+        p.visit_count,
+        h.visit_date,
+        h.visit_type,
+        h.from_visit,
+        host(p.url) AS domain
+    FROM moz_places p
+    JOIN moz_historyvisits h ON p.id = h.place_id
+    WHERE h.visit_date BETWEEN ? AND ?
+      AND (? = 0 OR h.visit_type != 7)  -- 7 is a private browsing visit
+    ORDER BY h.visit_date ASC
+"""
+
+# Only what the journal's per-domain tallies read, as plain tuples
+VISIT_DOMAINS_SQL = """
+    SELECT host(p.url), COALESCE(NULLIF(p.title, ''), 'Untitled')
+    FROM moz_places p
+    JOIN moz_historyvisits h ON p.id = h.place_id
+    WHERE h.visit_date BETWEEN ? AND ?
+      AND (? = 0 OR h.visit_type != 7)
+    ORDER BY h.visit_date ASC
+"""
+
+# Active time per domain and per local hour: the gap to the next visit of the same domain (or hour)
+# counts when it is under 30 minutes; longer gaps and each group's last visit count as 2 minutes
+TIME_SPENT_SQL = """
+    WITH visits AS (
+        SELECT host(p.url) AS domain, local_hour(h.visit_date) AS hour, h.visit_date
+        FROM moz_historyvisits h
+        JOIN moz_places p ON p.id = h.place_id
+        WHERE h.visit_date BETWEEN ? AND ?
+          AND (? = 0 OR h.visit_type != 7)
+    ),
+    gaps AS (
+        SELECT domain, hour, visit_date,
+               LEAD(visit_date) OVER (PARTITION BY domain ORDER BY visit_date) - visit_date AS domain_gap,
+               LEAD(visit_date) OVER (PARTITION BY hour ORDER BY visit_date) - visit_date AS hour_gap
+        FROM visits
+    )
+    SELECT 0 AS kind, domain AS key, 0 AS sites, MIN(visit_date) AS first_visit,
+           SUM(CASE WHEN domain_gap < 1800000000 THEN domain_gap ELSE 120000000 END) AS active_us
+    FROM gaps GROUP BY domain
+    UNION ALL
+    SELECT 1, hour, COUNT(DISTINCT domain), MIN(visit_date),
+           SUM(CASE WHEN hour_gap < 1800000000 THEN hour_gap ELSE 120000000 END)
+    FROM gaps GROUP BY hour
+    ORDER BY kind, first_visit
+"""
+
+MOST_VISITED_SQL = """
+    SELECT 
+        p.url,
+        p.title,
+        p.visit_count,
+        p.last_visit_date,
+        host(p.url) AS domain
+    FROM moz_places p
+    WHERE p.visit_count > 0
+    ORDER BY p.visit_count DESC
+    LIMIT ?
+"""
+
+BOOKMARKS_SQL = """
+    SELECT 
+        b.title,
+        p.url,
+        b.dateAdded,
+        b.lastModified,
+        host(p.url) AS domain
+    FROM moz_bookmarks b
+    JOIN moz_places p ON b.fk = p.id
+    WHERE b.type = 1 AND p.url IS NOT NULL
+    ORDER BY b.dateAdded DESC
+"""
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+@functools.lru_cache(maxsize=8192)
+def _local_offset(quarter_hour: int) -> int:
+    """Return the local UTC offset in seconds during a 15-minute slot since the epoch."""
+    moment = datetime.fromtimestamp(quarter_hour * 900, timezone.utc).astimezone()
+    return int(moment.utcoffset().total_seconds())
+
+def _local_seconds(visit_us: int) -> int:
+    """Convert a Firefox microsecond UTC timestamp to whole seconds of local wall-clock time."""
+    seconds = visit_us // 1_000_000
+    # Offsets change on quarter-hour boundaries, so one lookup per slot covers DST switches
+    return seconds + _local_offset(seconds // 900)
+
+@functools.lru_cache(maxsize=4096)
+def _date_from_epoch_days(days: int) -> date:
+    """Return the date a given number of days after 1970-01-01."""
+    return _EPOCH_DATE + timedelta(days=days)
+
+def _local_midnight_us(day: date) -> int:
+    """Return the Firefox microsecond timestamp of local midnight at the start of a date."""
+    wall_seconds = (day - _EPOCH_DATE).days * 86400
+    # Re-read the offset at the first UTC guess so days that start on a DST switch land right
+    first = _local_offset(wall_seconds // 900)
+    second = _local_offset((wall_seconds - first) // 900)
+    seconds = wall_seconds - second
+    if seconds + _local_offset(seconds // 900) != wall_seconds:
+        # Midnight falls in a spring-forward gap; the day starts when the clocks jump
+        seconds = wall_seconds - min(first, second)
+    return seconds * 1_000_000
+
+def _day_bounds(start_date: date, end_date: Optional[date] = None) -> Tuple[int, int]:
+    """Return the inclusive microsecond range covering local dates start_date..end_date."""
+    next_day = (end_date or start_date) + timedelta(days=1)
+    return _local_midnight_us(start_date), _local_midnight_us(next_day) - 1
+
+def visit_hour(visit_us: int) -> int:
+    """Return the local hour of day (0-23) of a visit timestamp."""
+    return _local_seconds(visit_us) // 3600 % 24
+
+def visit_date(visit_us: int) -> date:
+    """Return the local calendar date of a visit timestamp."""
+    return _date_from_epoch_days(_local_seconds(visit_us) // 86400)
+
+def firefox_profiles_dir() -> Path:
+    """Return the directory holding Firefox profiles on this OS."""
+    system = platform.system()
+    
+    if system == "Windows":
+        return Path(os.environ.get("APPDATA", "")) / "Mozilla" / "Firefox" / "Profiles"
+    elif system == "Darwin":  # macOS
+        return Path.home() / "Library" / "Application Support" / "Firefox" / "Profiles"
+    else:  # Linux and others
+        return Path.home() / ".mozilla" / "firefox"
+
+class _Snapshot:
+    """One temporary copy of places.sqlite and its connections, kept apart from the parser so a finalizer can release them."""
+    
+    def __init__(self, conn: sqlite3.Connection, temp_db: Path, mtime: Tuple[int, int]):
+        self.conn = conn
+        self.temp_db = temp_db
+        self.mtime = mtime
+        # Per-thread connections used while the snapshot is pinned
+        self.readers: Dict[int, sqlite3.Connection] = {}
+        # Reads currently holding one of this snapshot's connections
+        self.users = 0
+    
+    def close_readers(self):
+        """Close the per-thread snapshot connections."""
+        for conn in self.readers.values():
+            conn.close()
+        self.readers.clear()
+    
+    def close(self):
+        """Close every connection and delete the temporary copy."""
+        self.close_readers()
+        self.conn.close()
+        
+        try:
+            self.temp_db.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Failed to delete temporary database file: {e}")
+
+def _close_snapshots(snapshots: List[_Snapshot]):
+    """Close every snapshot a parser still holds."""
+    for snapshot in snapshots:
+        snapshot.close()
+    snapshots.clear()
+
 class FirefoxParser:
     def __init__(self, profile_path: Optional[str] = None):
         self.profile_path = profile_path or self._find_firefox_profile()
@@ -20,17 +206,22 @@ class FirefoxParser:
         if not self.places_db or not self.places_db.exists():
             logger.error("Firefox places.sqlite database not found")
             raise FileNotFoundError("Firefox places.sqlite database not found")
+        
+        # Temporary copies of places.sqlite, the current one last; a copy replaced after Firefox
+        # wrote new history stays open until the reads still using it finish
+        self._snapshots: List[_Snapshot] = []
+        self._conn_lock = threading.Lock()
+        
+        # While pinned, the snapshot is only refreshed by the first read and each thread reads through its own connection
+        self._pinned = 0
+        self._pin_refreshed = False
+        
+        # Releases the snapshots when the parser is collected or, failing that, at exit
+        self._finalizer = weakref.finalize(self, _close_snapshots, self._snapshots)
     
     def _find_firefox_profile(self) -> Optional[str]:
         """Find Firefox profile directory based on OS."""
-        system = platform.system()
-        
-        if system == "Windows":
-            firefox_dir = Path(os.environ.get("APPDATA", "")) / "Mozilla" / "Firefox" / "Profiles"
-        elif system == "Darwin":  # macOS
-            firefox_dir = Path.home() / "Library" / "Application Support" / "Firefox" / "Profiles"
-        else:  # Linux and others
-            firefox_dir = Path.home() / ".mozilla" / "firefox"
+        firefox_dir = firefox_profiles_dir()
         
         if not firefox_dir.exists():
             logger.warning(f"Firefox profile directory not found: {firefox_dir}")
@@ -61,7 +252,6 @@ class FirefoxParser:
         """Create a temporary copy of places.sqlite to avoid locking issues."""
         import tempfile
         import shutil
-        import time
         
         temp_dir = Path(tempfile.gettempdir())
         
@@ -69,6 +259,14 @@ class FirefoxParser:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         temp_db = temp_dir / f"places_copy_{timestamp}.sqlite"
         
+        try:
+            self._backup_places(temp_db)
+            return temp_db
+        except sqlite3.Error as e:
+            # A running Firefox holds places.sqlite in exclusive locking mode
+            logger.debug(f"Online backup unavailable, copying the file instead: {e}")
+            temp_db.unlink(missing_ok=True)
+        
         try:
             shutil.copy2(self.places_db, temp_db)
             return temp_db
@@ -76,126 +274,212 @@ class FirefoxParser:
             logger.error(f"Failed to copy Firefox database: {e}")
             raise
     
-    def get_history_for_date(self, target_date: date, exclude_private: bool = True) -> List[Dict]:
-        """Get browsing history for a specific date."""
-        temp_db = self._create_temp_db_copy()
-        history_data = []
+    def _backup_places(self, temp_db: Path):
+        """Snapshot places.sqlite with SQLite's online backup, which copies only live pages under a read lock."""
+        source = sqlite3.connect(f"{self.places_db.resolve().as_uri()}?mode=ro", uri=True, timeout=0)
+        try:
+            # backup() retries a busy source forever, so fail fast here while Firefox holds the lock
+            source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            target = sqlite3.connect(temp_db)
+            try:
+                source.backup(target)
+                # The snapshot inherits WAL mode; switch back so the copy is a single self-contained file
+                target.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                target.close()
+        finally:
+            source.close()
+    
+    def _places_mtime(self) -> Tuple[int, int]:
+        """Return modification times of places.sqlite and its WAL file, 0 when the WAL is absent."""
+        wal = self.places_db.with_name(self.places_db.name + "-wal")
+        try:
+            wal_mtime = wal.stat().st_mtime_ns
+        except OSError:
+            wal_mtime = 0
+        return self.places_db.stat().st_mtime_ns, wal_mtime
+    
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """Lend a read-only connection to a temporary copy of places.sqlite, copying only when it changed."""
+        with self._conn_lock:
+            # Outside a pin every read picks up new history; inside one only the first does
+            snapshot = self._current_locked(refresh=not self._pinned or not self._pin_refreshed)
+            if self._pinned:
+                self._pin_refreshed = True
+                conn = self._reader_conn_locked(snapshot)
+            else:
+                conn = snapshot.conn
+            snapshot.users += 1
         
         try:
-            # Convert date to Unix timestamp range (microseconds)
-            start_timestamp = int(datetime.combine(target_date, datetime.min.time()).timestamp() * 1_000_000)
-            end_timestamp = int(datetime.combine(target_date, datetime.max.time()).timestamp() * 1_000_000)
-            
-            with sqlite3.connect(temp_db) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = """
-                SELECT 
-                    p.url,
-                    p.title,
-                    p.visit_count,
-                    h.visit_date,
-                    h.visit_type,
-                    h.from_visit
-                FROM moz_places p
-                JOIN moz_historyvisits h ON p.id = h.place_id
-                WHERE h.visit_date BETWEEN ? AND ?
-                ORDER BY h.visit_date ASC
-                """
-                
-                cursor = conn.execute(query, (start_timestamp, end_timestamp))
+            yield conn
+        finally:
+            with self._conn_lock:
+                snapshot.users -= 1
+                if not snapshot.users and not self._pinned:
+                    snapshot.close_readers()
+                self._retire_idle_locked()
+    
+    def _current_locked(self, refresh: bool) -> _Snapshot:
+        """Return the current snapshot, first replacing it if asked to and places.sqlite changed; the caller holds the lock."""
+        current = self._snapshots[-1] if self._snapshots else None
+        if current is not None and not refresh:
+            return current
+        
+        mtime = self._places_mtime()
+        if current is not None and current.mtime == mtime:
+            return current
+        
+        temp_db = self._create_temp_db_copy()
+        self._index_temp_db(temp_db)
+        self._snapshots.append(_Snapshot(self._connect_snapshot(temp_db), temp_db, mtime))
+        self._retire_idle_locked()
+        return self._snapshots[-1]
+    
+    def _retire_idle_locked(self):
+        """Close replaced snapshots that no read is using any more; the caller holds the lock."""
+        for snapshot in self._snapshots[:-1]:
+            if not snapshot.users:
+                snapshot.close()
+                self._snapshots.remove(snapshot)
+    
+    def _connect_snapshot(self, temp_db: Path) -> sqlite3.Connection:
+        """Open a configured read-only connection to a snapshot."""
+        # immutable=1 tells SQLite the copy never changes, so it skips file locking entirely
+        conn = sqlite3.connect(
+            f"{temp_db.as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        configure_connection(conn, read_only=True)
+        conn.execute("PRAGMA query_only=1")
+        conn.create_function("host", 1, _extract_host, deterministic=True)
+        conn.create_function("local_hour", 1, visit_hour, deterministic=True)
+        return conn
+    
+    def _reader_conn_locked(self, snapshot: _Snapshot) -> sqlite3.Connection:
+        """Return the calling thread's own connection to a pinned snapshot; the caller holds the lock."""
+        thread_id = threading.get_ident()
+        conn = snapshot.readers.get(thread_id)
+        if conn is None:
+            conn = snapshot.readers[thread_id] = self._connect_snapshot(snapshot.temp_db)
+        return conn
+    
+    @contextmanager
+    def pinned(self):
+        """Keep one snapshot for the duration of a batch so worker threads can query it in parallel."""
+        with self._conn_lock:
+            if not self._pinned:
+                self._pin_refreshed = False
+            self._pinned += 1
+        try:
+            yield self
+        finally:
+            with self._conn_lock:
+                self._pinned -= 1
+                # Per-thread connections still lent out are closed when their read finishes
+                if not self._pinned and self._snapshots and not self._snapshots[-1].users:
+                    self._snapshots[-1].close_readers()
+    
+    def _index_temp_db(self, temp_db: Path):
+        """Add a covering visits index and planner statistics to the private copy before it is opened read-only."""
+        conn = sqlite3.connect(temp_db)
+        try:
+            conn.executescript("""
+                CREATE INDEX IF NOT EXISTS tmp_hv_date
+                    ON moz_historyvisits(visit_date, place_id, visit_type, from_visit);
+                ANALYZE;
+            """)
+        finally:
+            conn.close()
+    
+    def close(self):
+        """Close the cached connections and delete the temporary database copies."""
+        with self._conn_lock:
+            _close_snapshots(self._snapshots)
+    
+    def iter_history_for_date(self, target_date: date, exclude_private: bool = True) -> Iterator[Dict]:
+        """Yield browsing history for a specific date one visit at a time, straight from the cursor."""
+        with self._reading() as conn:
+            try:
+                # Convert date to Unix timestamp range (microseconds)
+                start_timestamp, end_timestamp = _day_bounds(target_date)
                 
-                for row in cursor.fetchall():
-                    # Skip private browsing if requested
-                    if exclude_private and row['visit_type'] == 7:  # Private browsing visit type
-                        continue
-                    
-                    # Convert timestamp back to datetime
-                    visit_datetime = datetime.fromtimestamp(row['visit_date'] / 1_000_000)
-                    
-                    # Parse URL to get domain
-                    parsed_url = urlparse(row['url'])
-                    domain = parsed_url.netloc.lower()
-                    
-                    # Clean domain (remove www. prefix)
-                    if domain.startswith('www.'):
-                        domain = domain[4:]
-                    
-                    history_data.append({
+                for row in conn.execute(HISTORY_SQL, (start_timestamp, end_timestamp, exclude_private)):
+                    yield {
                         'url': row['url'],
                         'title': row['title'] or 'Untitled',
-                        'domain': domain,
+                        'domain': row['domain'],
                         'visit_count': row['visit_count'],
-                        'visit_datetime': visit_datetime,
+                        'visit_us': row['visit_date'],
                         'visit_type': row['visit_type'],
                         'from_visit': row['from_visit']
-                    })
-        
-        except Exception as e:
-            logger.error(f"Error reading Firefox history: {e}")
+                    }
+            
+            except Exception as e:
+                logger.error(f"Error reading Firefox history: {e}")
+    
+    def iter_visit_domains(self, target_date: date, exclude_private: bool = True) -> Iterator[Tuple[str, str]]:
+        """Yield (domain, title) for each visit on a date, skipping the columns only full history needs."""
+        with self._reading() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            
+            try:
+                start_timestamp, end_timestamp = _day_bounds(target_date)
+                yield from cursor.execute(VISIT_DOMAINS_SQL, (start_timestamp, end_timestamp, exclude_private))
+            
+            except Exception as e:
+                logger.error(f"Error reading Firefox history: {e}")
+    
+    def get_history_for_date(self, target_date: date, exclude_private: bool = True) -> List[Dict]:
+        """Get browsing history for a specific date."""
+        return list(self.iter_history_for_date(target_date, exclude_private))
+    
+    def get_time_spent_for_date(self, target_date: date, exclude_private: bool = True) -> Tuple[Dict[str, int], Dict[int, Dict[str, int]]]:
+        """Estimate minutes spent per domain and per hour for a date, returning (domain_minutes, hourly_stats)."""
+        domain_minutes = {}
+        hourly_stats = {}
         
-        finally:
-            # Clean up temporary file
+        with self._reading() as conn:
             try:
-                if temp_db.exists():
-                    temp_db.unlink()
+                # Convert date to Unix timestamp range (microseconds)
+                start_timestamp, end_timestamp = _day_bounds(target_date)
+                
+                cursor = conn.execute(TIME_SPENT_SQL, (start_timestamp, end_timestamp, exclude_private))
+                
+                for kind, key, sites, _, active_us in cursor:
+                    minutes = active_us // 60_000_000
+                    if kind == 0:
+                        domain_minutes[key] = minutes
+                    else:
+                        hourly_stats[key] = {'sites_visited': sites, 'time_spent': minutes}
+            
             except Exception as e:
-                logger.warning(f"Failed to delete temporary database file: {e}")
+                logger.error(f"Error estimating Firefox time spent: {e}")
         
-        return history_data
+        return domain_minutes, hourly_stats
     
     def get_history_range(self, start_date: date, end_date: date, exclude_private: bool = True) -> Dict[str, List[Dict]]:
         """Get browsing history for a date range, grouped by date."""
-        temp_db = self._create_temp_db_copy()
         history_data = {}
         
-        try:
-            # Convert dates to Unix timestamp range (microseconds)
-            start_timestamp = int(datetime.combine(start_date, datetime.min.time()).timestamp() * 1_000_000)
-            end_timestamp = int(datetime.combine(end_date, datetime.max.time()).timestamp() * 1_000_000)
-            
-            with sqlite3.connect(temp_db) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = """
-                SELECT 
-                    p.url,
-                    p.title,
-                    p.visit_count,
-                    h.visit_date,
-                    h.visit_type,
-                    h.from_visit
-                FROM moz_places p
-                JOIN moz_historyvisits h ON p.id = h.place_id
-                WHERE h.visit_date BETWEEN ? AND ?
-                ORDER BY h.visit_date ASC
-                """
+        with self._reading() as conn:
+            try:
+                # Convert dates to Unix timestamp range (microseconds)
+                start_timestamp, end_timestamp = _day_bounds(start_date, end_date)
                 
-                cursor = conn.execute(query, (start_timestamp, end_timestamp))
+                cursor = conn.execute(HISTORY_SQL, (start_timestamp, end_timestamp, exclude_private))
                 
-                for row in cursor.fetchall():
-                    # Skip private browsing if requested
-                    if exclude_private and row['visit_type'] == 7:
-                        continue
-                    
-                    # Convert timestamp back to datetime
-                    visit_datetime = datetime.fromtimestamp(row['visit_date'] / 1_000_000)
-                    visit_date_str = visit_datetime.date().isoformat()
-                    
-                    # Parse URL to get domain
-                    parsed_url = urlparse(row['url'])
-                    domain = parsed_url.netloc.lower()
-                    
-                    # Clean domain (remove www. prefix)
-                    if domain.startswith('www.'):
-                        domain = domain[4:]
+                for row in cursor:
+                    visit_date_str = visit_date(row['visit_date']).isoformat()
                     
                     entry = {
                         'url': row['url'],
                         'title': row['title'] or 'Untitled',
-                        'domain': domain,
+                        'domain': row['domain'],
                         'visit_count': row['visit_count'],
-                        'visit_datetime': visit_datetime,
+                        'visit_us': row['visit_date'],
                         'visit_type': row['visit_type'],
                         'from_visit': row['from_visit']
                     }
@@ -204,50 +488,21 @@ class FirefoxParser:
                         history_data[visit_date_str] = []
                     
                     history_data[visit_date_str].append(entry)
-        
-        except Exception as e:
-            logger.error(f"Error reading Firefox history range: {e}")
-        
-        finally:
-            # Clean up temporary file
-            try:
-                if temp_db.exists():
-                    temp_db.unlink()
+            
             except Exception as e:
-                logger.warning(f"Failed to delete temporary database file: {e}")
+                logger.error(f"Error reading Firefox history range: {e}")
         
         return history_data
     
     def get_most_visited_sites(self, limit: int = 20) -> List[Dict]:
         """Get most visited sites from Firefox history."""
-        temp_db = self._create_temp_db_copy()
         sites = []
         
-        try:
-            with sqlite3.connect(temp_db) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = """
-                SELECT 
-                    p.url,
-                    p.title,
-                    p.visit_count,
-                    p.last_visit_date
-                FROM moz_places p
-                WHERE p.visit_count > 0
-                ORDER BY p.visit_count DESC
-                LIMIT ?
-                """
-                
-                cursor = conn.execute(query, (limit,))
+        with self._reading() as conn:
+            try:
+                cursor = conn.execute(MOST_VISITED_SQL, (limit,))
                 
-                for row in cursor.fetchall():
-                    parsed_url = urlparse(row['url'])
-                    domain = parsed_url.netloc.lower()
-                    
-                    if domain.startswith('www.'):
-                        domain = domain[4:]
-                    
+                for row in cursor:
                     # Convert last visit timestamp
                     last_visit = None
                     if row['last_visit_date']:
@@ -256,49 +511,25 @@ class FirefoxParser:
                     sites.append({
                         'url': row['url'],
                         'title': row['title'] or 'Untitled',
-                        'domain': domain,
+                        'domain': row['domain'],
                         'visit_count': row['visit_count'],
                         'last_visit': last_visit
                     })
-        
-        except Exception as e:
-            logger.error(f"Error getting most visited sites: {e}")
-        
-        finally:
-            temp_db.unlink(missing_ok=True)
+            
+            except Exception as e:
+                logger.error(f"Error getting most visited sites: {e}")
         
         return sites
     
     def get_bookmarks(self) -> List[Dict]:
         """Get bookmarks from Firefox."""
-        temp_db = self._create_temp_db_copy()
         bookmarks = []
         
-        try:
-            with sqlite3.connect(temp_db) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = """
-                SELECT 
-                    b.title,
-                    p.url,
-                    b.dateAdded,
-                    b.lastModified
-                FROM moz_bookmarks b
-                JOIN moz_places p ON b.fk = p.id
-                WHERE b.type = 1 AND p.url IS NOT NULL
-                ORDER BY b.dateAdded DESC
-                """
-                
-                cursor = conn.execute(query)
+        with self._reading() as conn:
+            try:
+                cursor = conn.execute(BOOKMARKS_SQL)
                 
-                for row in cursor.fetchall():
-                    parsed_url = urlparse(row['url'])
-                    domain = parsed_url.netloc.lower()
-                    
-                    if domain.startswith('www.'):
-                        domain = domain[4:]
-                    
+                for row in cursor:
                     # Convert timestamps
                     date_added = None
                     last_modified = None
@@ -312,16 +543,13 @@ class FirefoxParser:
                     bookmarks.append({
                         'title': row['title'] or 'Untitled',
                         'url': row['url'],
-                        'domain': domain,
+                        'domain': row['domain'],
                         'date_added': date_added,
                         'last_modified': last_modified
                     })
-        
-        except Exception as e:
-            logger.error(f"Error getting bookmarks: {e}")
-        
-        finally:
-            temp_db.unlink(missing_ok=True)
+            
+            except Exception as e:
+                logger.error(f"Error getting bookmarks: {e}")
         
         return bookmarks
     
@@ -1,7 +1,9 @@
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Any, Optional
-from collections import Counter, defaultdict
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from urllib.parse import urlparse
 import re
 
@@ -10,6 +12,25 @@ from .database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Keyword rules for domains without a stored category, in priority order
+_DEFAULT_CATEGORY_RULES = (
+    ('dev', "Development", 0.7, ('github', 'gitlab', 'stackoverflow', 'docs', 'developer')),
+    ('ent', "Entertainment", -0.3, ('youtube', 'netflix', 'twitch', 'entertainment')),
+    ('social', "Social Media", -0.2, ('facebook', 'twitter', 'instagram', 'tiktok', 'social')),
+    ('news', "News", 0.1, ('news', 'cnn', 'bbc', 'reuters')),
+    ('research', "Research", 0.6, ('wikipedia', 'research', 'academic', 'edu')),
+    ('mail', "Communication", 0.3, ('mail', 'email', 'gmail', 'outlook')),
+    ('shop', "Shopping", -0.1, ('shop', 'amazon', 'ebay', 'store')),
+)
+
+# One lookahead branch per rule, all anchored at the start, so the first rule with a keyword
+# anywhere in the domain wins, exactly like checking the rules one after another
+_CATEGORY_RE = re.compile('|'.join(
+    f"(?P<{name}>(?=.*(?:{'|'.join(map(re.escape, keywords))})))"
+    for name, _, _, keywords in _DEFAULT_CATEGORY_RULES
+), re.DOTALL)
+_CATEGORY_BY_GROUP = {name: (category, weight) for name, category, weight, _ in _DEFAULT_CATEGORY_RULES}
+
 class JournalGenerator:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
@@ -20,108 +41,40 @@ class JournalGenerator:
         except FileNotFoundError:
             logger.warning("Firefox profile not found. Journal generation will be limited.")
     
-    def _categorize_domain(self, domain: str) -> Dict[str, Any]:
-        """Categorize a domain and return category info."""
-        category_info = self.db_manager.get_site_category(domain)
-        
-        if category_info:
-            return category_info
-        
-        # Default categorization based on domain patterns
-        category = "Uncategorized"
-        productivity_weight = 0.0
-        
-        if any(keyword in domain for keyword in ['github', 'gitlab', 'stackoverflow', 'docs', 'developer']):
-            category = "Development"
-            productivity_weight = 0.7
-        elif any(keyword in domain for keyword in ['youtube', 'netflix', 'twitch', 'entertainment']):
-            category = "Entertainment"
-            productivity_weight = -0.3
-        elif any(keyword in domain for keyword in ['facebook', 'twitter', 'instagram', 'tiktok', 'social']):
-            category = "Social Media"
-            productivity_weight = -0.2
-        elif any(keyword in domain for keyword in ['news', 'cnn', 'bbc', 'reuters']):
-            category = "News"
-            productivity_weight = 0.1
-        elif any(keyword in domain for keyword in ['wikipedia', 'research', 'academic', 'edu']):
-            category = "Research"
-            productivity_weight = 0.6
-        elif any(keyword in domain for keyword in ['mail', 'email', 'gmail', 'outlook']):
-            category = "Communication"
-            productivity_weight = 0.3
-        elif any(keyword in domain for keyword in ['shop', 'amazon', 'ebay', 'store']):
-            category = "Shopping"
-            productivity_weight = -0.1
-        
-        # Save new category to database
-        self.db_manager.add_site_category(domain, category, productivity_weight)
-        
-        return {
-            'domain': domain,
-            'category': category,
-            'productivity_weight': productivity_weight
-        }
+    def _default_category(self, domain: str) -> Tuple[str, float]:
+        """Guess a category and productivity weight for an unknown domain from its name."""
+        match = _CATEGORY_RE.match(domain)
+        if match:
+            return _CATEGORY_BY_GROUP[match.lastgroup]
+        return "Uncategorized", 0.0
     
-    def _calculate_time_spent(self, visits: List[Dict]) -> int:
-        """Estimate time spent browsing based on visit patterns."""
-        if not visits:
-            return 0
-        
-        total_time = 0
-        visits_by_time = sorted(visits, key=lambda x: x['visit_datetime'])
-        
-        for i in range(len(visits_by_time) - 1):
-            current_visit = visits_by_time[i]
-            next_visit = visits_by_time[i + 1]
-            
-            time_diff = (next_visit['visit_datetime'] - current_visit['visit_datetime']).total_seconds()
-            
-            # If the gap is less than 30 minutes, assume user was active
-            # Cap individual session time at 30 minutes to avoid overestimating
-            if time_diff < 1800:  # 30 minutes
-                total_time += min(time_diff, 1800)
-            else:
-                # Assume 2 minutes for standalone visits
-                total_time += 120
-        
-        # Add time for the last visit
-        total_time += 120
-        
-        return int(total_time / 60)  # Return minutes
-    
-    def _generate_hourly_stats(self, history_data: List[Dict]) -> Dict[int, Dict[str, int]]:
-        """Generate hourly browsing statistics."""
-        hourly_stats = defaultdict(lambda: {'sites_visited': 0, 'time_spent': 0})
-        hourly_visits = defaultdict(list)
-        
-        # Group visits by hour
-        for visit in history_data:
-            hour = visit['visit_datetime'].hour
-            hourly_visits[hour].append(visit)
-        
-        # Calculate stats for each hour
-        for hour, visits in hourly_visits.items():
-            unique_domains = set(visit['domain'] for visit in visits)
-            time_spent = self._calculate_time_spent(visits)
-            
-            hourly_stats[hour] = {
-                'sites_visited': len(unique_domains),
-                'time_spent': time_spent
-            }
+    def _categorize_domains(self, domains: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Categorize domains in bulk, saving default categories for unknown ones in one write."""
+        categories = self.db_manager.get_site_categories(domains)
+        
+        new_rows = [
+            (domain, *self._default_category(domain))
+            for domain in domains if domain not in categories
+        ]
+        if new_rows:
+            self.db_manager.add_site_categories(new_rows)
+            for domain, category, productivity_weight in new_rows:
+                categories[domain] = {
+                    'domain': domain,
+                    'category': category,
+                    'productivity_weight': productivity_weight
+                }
         
-        return dict(hourly_stats)
+        return categories
     
     def _calculate_productivity_score(self, category_stats: Dict[str, Dict]) -> float:
         """Calculate productivity score based on time spent in different categories."""
-        total_time = sum(stats['time_spent'] for stats in category_stats.values())
+        stats_values = category_stats.values()
+        total_time = sum(stats['time_spent'] for stats in stats_values)
         if total_time == 0:
             return 0.0
         
-        weighted_score = 0.0
-        for category, stats in category_stats.items():
-            weight = stats['productivity_weight']
-            time_ratio = stats['time_spent'] / total_time
-            weighted_score += weight * time_ratio
+        weighted_score = sum(stats['productivity_weight'] * (stats['time_spent'] / total_time) for stats in stats_values)
         
         # Normalize to 0-10 scale
         return round(5 + (weighted_score * 5), 2)
@@ -169,40 +122,50 @@ class JournalGenerator:
             return None
         
         try:
-            # Get history data for the date
-            history_data = self.firefox_parser.get_history_for_date(target_date)
-            
-            if not history_data:
-                logger.info(f"No browsing history found for {target_date}")
-                return None
+            # Visits and minutes are both read from one history snapshot
+            with self.firefox_parser.pinned():
+                # Count visits and collect distinct titles per domain straight from the history cursor
+                domain_visit_count = {}
+                domain_titles = {}
+                for domain, title in self.firefox_parser.iter_visit_domains(target_date):
+                    domain_visit_count[domain] = domain_visit_count.get(domain, 0) + 1
+                    domain_titles.setdefault(domain, set()).add(title)
+                
+                if not domain_visit_count:
+                    logger.info(f"No browsing history found for {target_date}")
+                    return None
+                
+                # Time per domain and per hour, computed by SQLite window functions in one query
+                domain_minutes, hourly_stats = self.firefox_parser.get_time_spent_for_date(target_date)
             
             # Analyze browsing patterns
-            domain_stats = defaultdict(lambda: {'visits': 0, 'time_spent': 0, 'titles': set()})
-            category_stats = defaultdict(lambda: {'time_spent': 0, 'visits': 0, 'productivity_weight': 0.0})
+            category_stats = {}
             
-            # Group visits by domain
-            domain_visits = defaultdict(list)
-            for visit in history_data:
-                domain_visits[visit['domain']].append(visit)
+            # Look up or assign categories for all of the day's domains at once
+            domain_categories = self._categorize_domains(list(domain_visit_count))
             
             # Calculate stats for each domain
-            for domain, visits in domain_visits.items():
-                category_info = self._categorize_domain(domain)
-                time_spent = self._calculate_time_spent(visits)
+            domain_stats = {}
+            for domain, visits in domain_visit_count.items():
+                category_info = domain_categories[domain]
+                category = category_info['category']
+                time_spent = domain_minutes.get(domain, 0)
                 
                 domain_stats[domain] = {
-                    'visits': len(visits),
+                    'visits': visits,
                     'time_spent': time_spent,
-                    'titles': set(visit['title'] for visit in visits),
-                    'category': category_info['category'],
-                    'productivity_weight': category_info['productivity_weight']
+                    'titles': list(domain_titles[domain]),
+                    'category': category
                 }
                 
                 # Aggregate by category
-                category = category_info['category']
-                category_stats[category]['time_spent'] += time_spent
-                category_stats[category]['visits'] += len(visits)
-                category_stats[category]['productivity_weight'] = category_info['productivity_weight']
+                try:
+                    stats = category_stats[category]
+                except KeyError:
+                    stats = category_stats[category] = {'time_spent': 0, 'visits': 0, 'productivity_weight': 0.0}
+                stats['time_spent'] += time_spent
+                stats['visits'] += visits
+                stats['productivity_weight'] = category_info['productivity_weight']
             
             # Calculate overall statistics
             total_sites_visited = len(domain_stats)
@@ -216,9 +179,6 @@ class JournalGenerator:
                 reverse=True
             )
             
-            # Get hourly statistics
-            hourly_stats = self._generate_hourly_stats(history_data)
-            
             # Generate summary
             stats_for_summary = {
                 'total_sites_visited': total_sites_visited,
@@ -236,21 +196,19 @@ class JournalGenerator:
                 'productivity_score': productivity_score,
                 'summary': summary,
                 'raw_data': {
-                    'domain_stats': {domain: {
-                        'visits': stats['visits'],
-                        'time_spent': stats['time_spent'],
-                        'titles': list(stats['titles']),
-                        'category': stats['category']
-                    } for domain, stats in domain_stats.items()},
+                    'domain_stats': domain_stats,
                     'hourly_stats': hourly_stats,
-                    'category_breakdown': dict(category_stats)
+                    'category_breakdown': category_stats
                 }
             }
             
-            # Save to database
-            success = self.db_manager.save_journal_entry(target_date, journal_data)
+            # Save the entry and its hourly stats in one transaction
+            with self.db_manager.batch():
+                success = self.db_manager.save_journal_entry(target_date, journal_data)
+                if success:
+                    self.db_manager.save_daily_stats(target_date, hourly_stats)
+            
             if success:
-                self.db_manager.save_daily_stats(target_date, hourly_stats)
                 logger.info(f"Successfully generated journal entry for {target_date}")
                 return journal_data
             else:
@@ -261,31 +219,28 @@ class JournalGenerator:
             logger.error(f"Error generating journal for {target_date}: {e}")
             return None
     
+    def generate_daily_journals(self, dates: List[date], max_workers: Optional[int] = None) -> Dict[date, Optional[Dict[str, Any]]]:
+        """Generate journals for several dates concurrently, keyed by date (None where a day had no history)."""
+        if not dates:
+            return {}
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(dates))
+        
+        # Every day reads the same history snapshot, each worker thread through its own connection
+        pinned = self.firefox_parser.pinned() if self.firefox_parser else nullcontext()
+        with pinned, ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(dates, pool.map(self.generate_daily_journal, dates)))
+    
     def generate_weekly_summary(self, start_date: date) -> Optional[Dict[str, Any]]:
         """Generate a weekly summary from daily journal entries."""
         end_date = start_date + timedelta(days=6)
-        daily_entries = self.db_manager.get_journal_entries_range(start_date, end_date)
+        total_sites, total_time, avg_productivity, entry_count = self.db_manager.get_weekly_summary(start_date, end_date)
         
-        if not daily_entries:
+        if not entry_count:
             return None
         
-        # Aggregate weekly statistics
-        total_sites = sum(entry['total_sites_visited'] for entry in daily_entries)
-        total_time = sum(entry['total_time_spent'] for entry in daily_entries)
-        avg_productivity = sum(entry['productivity_score'] for entry in daily_entries) / len(daily_entries)
-        
-        # Aggregate categories across the week
-        weekly_categories = defaultdict(lambda: {'time_spent': 0, 'visits': 0})
-        for entry in daily_entries:
-            for category in entry['top_categories']:
-                weekly_categories[category['category']]['time_spent'] += category['time_spent']
-                weekly_categories[category['category']]['visits'] += category['visits']
-        
-        top_weekly_categories = sorted(
-            [{'category': cat, **stats} for cat, stats in weekly_categories.items()],
-            key=lambda x: x['time_spent'],
-            reverse=True
-        )
+        # Category totals are summed by SQLite straight from the stored JSON
+        top_weekly_categories = self.db_manager.get_category_totals(start_date, end_date)
         
         return {
             'start_date': start_date.isoformat(),
@@ -294,5 +249,5 @@ class JournalGenerator:
             'total_time_spent': total_time,
             'average_productivity_score': round(avg_productivity, 2),
             'top_categories': top_weekly_categories,
-            'daily_entries_count': len(daily_entries)
+            'daily_entries_count': entry_count
         }
\ No newline at end of file
@@ -1,27 +1,17 @@
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from string import Formatter
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+import functools
+import heapq
+import itertools
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
-class MarkdownExporter:
-    def __init__(self, output_dir: str = "./journals", template_path: str = "./templates/daily_template.md"):
-        self.output_dir = Path(output_dir)
-        self.template_path = Path(template_path)
-        self.output_dir.mkdir(exist_ok=True)
-        
-        # Load template
-        self.template = ""
-        if self.template_path.exists():
-            self.template = self.template_path.read_text(encoding='utf-8')
-        else:
-            logger.warning(f"Template file not found: {template_path}. Using default template.")
-            self.template = self._get_default_template()
-    
-    def _get_default_template(self) -> str:
-        """Return a default template if no template file is found."""
-        return """# Daily Journal - {date}
+# Used when the configured template file is missing
+DAILY_TEMPLATE = """# Daily Journal - {date}
 
 ## Summary
 {summary}
@@ -52,171 +42,277 @@ class MarkdownExporter:
 
 ---
 *Generated on {generated_at} by Firefox History Journal Generator*"""
+
+WEEKLY_TEMPLATE = """# Weekly Summary - {period}
+
+## Overview
+- **Total Sites Visited**: {total_sites_visited}
+- **Total Time Spent**: {total_time}
+- **Average Productivity Score**: {average_productivity_score}/10
+- **Days with Data**: {daily_entries_count}
+
+## Top Categories This Week
+{top_categories}
+
+---
+*Generated on {generated_at} by Firefox History Journal Generator*"""
+
+def _encode(text: str) -> bytes:
+    """Encode text for a journal file, with the newline translation write_text applied."""
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode('utf-8')
+
+def _compile_template(template: str) -> Optional[List[Tuple[bytes, Optional[str]]]]:
+    """Split a str.format template into (encoded literal, field name) pairs, or None if it needs more than plain substitution."""
+    try:
+        tokens = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if format_spec or conversion or (field_name is not None and not field_name.isidentifier()):
+                return None
+            tokens.append((_encode(literal), field_name))
+        return tokens
+    except ValueError:
+        # Malformed templates keep failing at export time, as str.format would
+        return None
+
+def _render_template(template: str, tokens: Optional[List[Tuple[bytes, Optional[str]]]], values: Dict[str, Any]) -> List[bytes]:
+    """Fill a template as a list of encoded chunks, falling back to str.format when it could not be compiled."""
+    if tokens is None:
+        return [_encode(template.format(**values))]
     
-    def _format_time_duration(self, minutes: int) -> str:
-        """Convert minutes to human-readable format."""
-        if minutes < 60:
-            return f"{minutes} minutes"
-        
-        hours = minutes // 60
-        remaining_minutes = minutes % 60
-        
-        if remaining_minutes == 0:
-            return f"{hours} hour{'s' if hours != 1 else ''}"
-        else:
-            return f"{hours} hour{'s' if hours != 1 else ''} {remaining_minutes} minute{'s' if remaining_minutes != 1 else ''}"
+    # Only the values are encoded per export; the literals were encoded once
+    chunks = []
+    for literal, field_name in tokens:
+        chunks.append(literal)
+        if field_name is not None:
+            chunks.append(_encode(str(values[field_name])))
+    return chunks
+
+_WEEKLY_TOKENS = _compile_template(WEEKLY_TEMPLATE)
+
+# One row of the hourly activity table: hour, sites visited, formatted time
+_HOURLY_ROW = "| %02d:00 | %d | %s |"
+
+def _generated_at() -> str:
+    """Return the current local time as shown in the export footers."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def _write_file(path: Path, chunks: List[bytes]):
+    """Write encoded chunks to a file with raw os calls, gathering them in one writev where available."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        written = os.writev(fd, chunks) if hasattr(os, 'writev') else 0
+        if written < sum(map(len, chunks)):
+            data = memoryview(b"".join(chunks))[written:]
+            while data:
+                data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+@functools.lru_cache(maxsize=4096)
+def _format_time_duration(minutes: int) -> str:
+    """Convert minutes to human-readable format."""
+    if minutes < 60:
+        return f"{minutes} minutes"
     
-    def _format_categories(self, categories: list) -> str:
-        """Format category data into markdown."""
-        if not categories:
-            return "No browsing activity recorded."
-        
-        lines = []
-        for i, category in enumerate(categories, 1):
-            category_name = category['category']
-            time_spent = category['time_spent']
-            visits = category.get('visits', 0)
-            
-            time_str = self._format_time_duration(time_spent)
-            lines.append(f"{i}. **{category_name}** - {time_str} ({visits} visits)")
-        
-        return "\n".join(lines)
+    hours = minutes // 60
+    remaining_minutes = minutes % 60
     
-    def _format_hourly_activity(self, hourly_stats: Dict[int, Dict[str, int]]) -> str:
-        """Format hourly activity into markdown."""
-        if not hourly_stats:
-            return "No hourly data available."
-        
-        lines = ["| Hour | Sites Visited | Time Spent |", "|------|---------------|------------|"]
-        
-        for hour in range(24):
-            if hour in hourly_stats:
-                stats = hourly_stats[hour]
-                sites = stats['sites_visited']
-                time_spent = stats['time_spent']
-                time_str = self._format_time_duration(time_spent) if time_spent > 0 else "0 minutes"
-                lines.append(f"| {hour:02d}:00 | {sites} | {time_str} |")
-            else:
-                lines.append(f"| {hour:02d}:00 | 0 | 0 minutes |")
-        
-        return "\n".join(lines)
+    if remaining_minutes == 0:
+        return f"{hours} hour{'s' if hours != 1 else ''}"
+    else:
+        return f"{hours} hour{'s' if hours != 1 else ''} {remaining_minutes} minute{'s' if remaining_minutes != 1 else ''}"
+
+# Stand-in for hours without any recorded activity
+_ZERO_STAT = {'sites_visited': 0, 'time_spent': 0}
+
+# Insight tables, checked top to bottom; the first tier whose threshold is met wins
+_PRODUCTIVITY_TIERS = (
+    (8, "🎯 Excellent productivity! You focused on valuable activities."),
+    (6, "👍 Good productivity with a healthy balance of work and leisure."),
+    (4, "⚖️ Moderate productivity. Consider focusing more on valuable activities."),
+    (float('-inf'), "⚠️ Low productivity day. Mostly entertainment or social media browsing."),
+)
+# Minutes of browsing that must be exceeded
+_TIME_TIERS = (
+    (480, "⏰ Heavy browsing day with over 8 hours of activity."),
+    (240, "📊 Moderate browsing activity (4-8 hours)."),
+    (60, "📱 Light browsing activity (1-4 hours)."),
+    (float('-inf'), "🔵 Minimal browsing activity today."),
+)
+_CATEGORY_INSIGHTS = {
+    'Development': "💻 Strong focus on development and technical activities.",
+    'Entertainment': "🎬 Entertainment was the primary focus today.",
+    'Social Media': "📱 Social media consumed most of your browsing time.",
+    'Research': "📚 Great focus on research and learning activities.",
+}
+
+def _format_categories(categories: list) -> str:
+    """Format category data into markdown."""
+    if not categories:
+        return "No browsing activity recorded."
     
-    def _format_top_domains(self, domain_stats: Dict[str, Dict]) -> str:
-        """Format top domains into markdown."""
-        if not domain_stats:
-            return "No domain data available."
-        
-        # Sort domains by time spent
-        sorted_domains = sorted(
-            domain_stats.items(),
-            key=lambda x: x[1]['time_spent'],
-            reverse=True
-        )
-        
-        lines = []
-        for i, (domain, stats) in enumerate(sorted_domains[:10], 1):
-            time_spent = stats['time_spent']
-            visits = stats['visits']
-            category = stats.get('category', 'Uncategorized')
-            
-            time_str = self._format_time_duration(time_spent)
-            lines.append(f"{i}. **{domain}** ({category}) - {time_str} ({visits} visits)")
-        
-        return "\n".join(lines)
+    fmt = _format_time_duration
+    return "\n".join([
+        f"{i}. **{category['category']}** - {fmt(category['time_spent'])} ({category.get('visits', 0)} visits)"
+        for i, category in enumerate(categories, 1)
+    ])
+
+def _format_hourly_activity(hourly_stats: Union[List[Dict[str, int]], Dict[int, Dict[str, int]]]) -> str:
+    """Format hourly activity into markdown from a 24-slot list indexed by hour (preferred) or an hour-keyed dict."""
+    if not hourly_stats:
+        return "No hourly data available."
     
-    def _format_notable_activities(self, domain_stats: Dict[str, Dict]) -> str:
-        """Extract and format notable activities."""
-        if not domain_stats:
-            return "No notable activities."
+    if isinstance(hourly_stats, dict):
+        zero = _ZERO_STAT
+        hourly_stats = [hourly_stats.get(hour, zero) for hour in range(24)]
+    
+    lines = ["| Hour | Sites Visited | Time Spent |", "|------|---------------|------------|"]
+    
+    append, fmt = lines.append, _format_time_duration
+    for hour, stats in enumerate(hourly_stats):
+        time_spent = stats['time_spent']
+        time_str = fmt(time_spent) if time_spent > 0 else "0 minutes"
+        append(_HOURLY_ROW % (hour, stats['sites_visited'], time_str))
+    
+    return "\n".join(lines)
+
+def _format_top_domains(domain_stats: Dict[str, Dict]) -> str:
+    """Format top domains into markdown."""
+    if not domain_stats:
+        return "No domain data available."
+    
+    # Pick the ten domains with the most time without sorting all of them
+    top_domains = heapq.nlargest(10, domain_stats.items(), key=lambda x: x[1]['time_spent'])
+    
+    lines = []
+    append, fmt = lines.append, _format_time_duration
+    for i, (domain, stats) in enumerate(top_domains, 1):
+        time_spent = stats['time_spent']
+        visits = stats['visits']
+        category = stats.get('category', 'Uncategorized')
         
-        activities = []
+        append(f"{i}. **{domain}** ({category}) - {fmt(time_spent)} ({visits} visits)")
+    
+    return "\n".join(lines)
+
+def _format_notable_activities(domain_stats: Dict[str, Dict]) -> str:
+    """Extract and format notable activities."""
+    if not domain_stats:
+        return "No notable activities."
+    
+    activities = []
+    append, fmt = activities.append, _format_time_duration
+    
+    # Find domains with high activity, stopping once the output limit is reached
+    for domain, stats in domain_stats.items():
+        if len(activities) >= 15:
+            break
         
-        # Find domains with high activity
-        for domain, stats in domain_stats.items():
-            time_spent = stats['time_spent']
-            visits = stats['visits']
-            category = stats.get('category', 'Uncategorized')
-            titles = stats.get('titles', [])
-            
-            if time_spent > 30:  # More than 30 minutes
-                activities.append(f"- Spent significant time on **{domain}** ({category}) - {self._format_time_duration(time_spent)}")
-            elif visits > 10:  # Many visits
-                activities.append(f"- Frequently visited **{domain}** ({category}) - {visits} visits")
-            
-            # Add interesting titles
-            if titles and len(titles) > 0:
-                interesting_titles = [title for title in titles if len(title) > 20 and title != 'Untitled'][:3]
-                if interesting_titles:
-                    for title in interesting_titles:
-                        activities.append(f"  - \"{title[:80]}{'...' if len(title) > 80 else ''}\"")
+        time_spent = stats['time_spent']
+        visits = stats['visits']
+        titles = stats.get('titles')
         
-        if not activities:
-            return "No significant activities detected."
+        if time_spent > 30:  # More than 30 minutes
+            append(f"- Spent significant time on **{domain}** ({stats.get('category', 'Uncategorized')}) - {fmt(time_spent)}")
+        elif visits > 10:  # Many visits
+            append(f"- Frequently visited **{domain}** ({stats.get('category', 'Uncategorized')}) - {visits} visits")
         
-        return "\n".join(activities[:15])  # Limit to top 15 activities
+        # Add interesting titles
+        if titles:
+            interesting_titles = (title for title in titles if len(title) > 20 and title != 'Untitled')
+            for title in itertools.islice(interesting_titles, 3):
+                append(f"  - \"{title[:80]}{'...' if len(title) > 80 else ''}\"")
     
-    def _generate_insights(self, journal_data: Dict[str, Any]) -> str:
-        """Generate insights based on the data."""
-        insights = []
-        
-        productivity_score = journal_data.get('productivity_score', 0)
-        total_time = journal_data.get('total_time_spent', 0)
-        top_categories = journal_data.get('top_categories', [])
+    if not activities:
+        return "No significant activities detected."
+    
+    return "\n".join(activities[:15])  # Limit to top 15 activities
+
+def _generate_insights(journal_data: Dict[str, Any]) -> str:
+    """Generate insights based on the data."""
+    insights = []
+    
+    productivity_score = journal_data.get('productivity_score', 0)
+    total_time = journal_data.get('total_time_spent', 0)
+    top_categories = journal_data.get('top_categories', [])
+    
+    # Productivity insights
+    for threshold, message in _PRODUCTIVITY_TIERS:
+        if productivity_score >= threshold:
+            insights.append(message)
+            break
+    
+    # Time insights
+    for threshold, message in _TIME_TIERS:
+        if total_time > threshold:
+            insights.append(message)
+            break
+    
+    # Category insights
+    if top_categories:
+        message = _CATEGORY_INSIGHTS.get(top_categories[0]['category'])
+        if message:
+            insights.append(message)
+    
+    # Patterns
+    raw_data = journal_data.get('raw_data', {})
+    hourly_stats = raw_data.get('hourly_stats', {})
+    
+    if hourly_stats:
+        hour_items = enumerate(hourly_stats) if isinstance(hourly_stats, list) else hourly_stats.items()
+        peak_hours = heapq.nlargest(3, hour_items, key=lambda x: x[1]['time_spent'])
+        if peak_hours:
+            peak_hour = peak_hours[0][0]
+            if 9 <= peak_hour <= 17:
+                insights.append("🏢 Peak activity during business hours.")
+            elif 18 <= peak_hour <= 23:
+                insights.append("🌆 Most active during evening hours.")
+            else:
+                insights.append("🌙 Unusual activity pattern with late-night browsing.")
+    
+    if not insights:
+        insights.append("📊 Standard browsing pattern detected.")
+    
+    # insights is never empty here, so one join yields the whole bullet list
+    return "- " + "\n- ".join(insights)
+
+class MarkdownExporter:
+    # Output directories already created by this process, keyed by absolute path
+    _created_dirs: Set[Path] = set()
+    
+    def __init__(self, output_dir: str = "./journals", template_path: str = "./templates/daily_template.md"):
+        self.output_dir = Path(output_dir)
+        self.template_path = Path(template_path)
         
-        # Productivity insights
-        if productivity_score >= 8:
-            insights.append("🎯 Excellent productivity! You focused on valuable activities.")
-        elif productivity_score >= 6:
-            insights.append("👍 Good productivity with a healthy balance of work and leisure.")
-        elif productivity_score >= 4:
-            insights.append("⚖️ Moderate productivity. Consider focusing more on valuable activities.")
-        else:
-            insights.append("⚠️ Low productivity day. Mostly entertainment or social media browsing.")
+        output_key = self.output_dir.absolute()
+        if output_key not in MarkdownExporter._created_dirs:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            MarkdownExporter._created_dirs.add(output_key)
         
-        # Time insights
-        if total_time > 480:  # More than 8 hours
-            insights.append("⏰ Heavy browsing day with over 8 hours of activity.")
-        elif total_time > 240:  # 4-8 hours
-            insights.append("📊 Moderate browsing activity (4-8 hours).")
-        elif total_time > 60:  # 1-4 hours
-            insights.append("📱 Light browsing activity (1-4 hours).")
+        # Load template
+        self.template = ""
+        if self.template_path.exists():
+            self.template = self.template_path.read_text(encoding='utf-8')
         else:
-            insights.append("🔵 Minimal browsing activity today.")
-        
-        # Category insights
-        if top_categories:
-            top_category = top_categories[0]
-            if top_category['category'] == 'Development':
-                insights.append("💻 Strong focus on development and technical activities.")
-            elif top_category['category'] == 'Entertainment':
-                insights.append("🎬 Entertainment was the primary focus today.")
-            elif top_category['category'] == 'Social Media':
-                insights.append("📱 Social media consumed most of your browsing time.")
-            elif top_category['category'] == 'Research':
-                insights.append("📚 Great focus on research and learning activities.")
-        
-        # Patterns
-        raw_data = journal_data.get('raw_data', {})
-        hourly_stats = raw_data.get('hourly_stats', {})
-        
-        if hourly_stats:
-            peak_hours = sorted(hourly_stats.items(), key=lambda x: x[1]['time_spent'], reverse=True)[:3]
-            if peak_hours:
-                peak_hour = peak_hours[0][0]
-                if 9 <= peak_hour <= 17:
-                    insights.append("🏢 Peak activity during business hours.")
-                elif 18 <= peak_hour <= 23:
-                    insights.append("🌆 Most active during evening hours.")
-                else:
-                    insights.append("🌙 Unusual activity pattern with late-night browsing.")
-        
-        if not insights:
-            insights.append("📊 Standard browsing pattern detected.")
+            logger.warning(f"Template file not found: {template_path}. Using default template.")
+            self.template = DAILY_TEMPLATE
         
-        return "\n".join(f"- {insight}" for insight in insights)
+        # Parse the template once; exports only substitute values
+        self._template_tokens = _compile_template(self.template)
+    
+    def export_daily_journal(self, journal_date: date, journal_data: Dict[str, Any], generated_at: Optional[str] = None) -> Optional[Path]:
+        """Export journal data to a markdown file, stamped with generated_at or the current time."""
+        return self._export_daily(journal_date, journal_data, generated_at or _generated_at())
+    
+    def export_batch_daily_journals(self, entries: List[Tuple[date, Dict[str, Any]]]) -> List[Optional[Path]]:
+        """Export several days' journals sharing one generation timestamp; failed days yield None."""
+        generated_at = _generated_at()
+        return [self._export_daily(journal_date, journal_data, generated_at) for journal_date, journal_data in entries]
     
-    def export_daily_journal(self, journal_date: date, journal_data: Dict[str, Any]) -> Optional[Path]:
-        """Export journal data to a markdown file."""
+    def _export_daily(self, journal_date: date, journal_data: Dict[str, Any], generated_at: str) -> Optional[Path]:
+        """Render one day's journal with a preformatted generation timestamp and write it to disk."""
         try:
             # Prepare template variables
             total_minutes = journal_data.get('total_time_spent', 0)
@@ -229,25 +325,25 @@ class MarkdownExporter:
                 'summary': journal_data.get('summary', 'No summary available.'),
                 'total_sites_visited': journal_data.get('total_sites_visited', 0),
                 'total_time_spent': total_minutes,
-                'total_time_hours': self._format_time_duration(total_minutes),
+                'total_time_hours': _format_time_duration(total_minutes),
                 'productivity_score': journal_data.get('productivity_score', 0),
-                'top_categories': self._format_categories(journal_data.get('top_categories', [])),
-                'hourly_activity': self._format_hourly_activity(hourly_stats),
-                'top_domains': self._format_top_domains(domain_stats),
-                'notable_activities': self._format_notable_activities(domain_stats),
-                'insights': self._generate_insights(journal_data),
-                'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'top_categories': _format_categories(journal_data.get('top_categories', [])),
+                'hourly_activity': _format_hourly_activity(hourly_stats),
+                'top_domains': _format_top_domains(domain_stats),
+                'notable_activities': _format_notable_activities(domain_stats),
+                'insights': _generate_insights(journal_data),
+                'generated_at': generated_at
             }
             
             # Fill template
-            markdown_content = self.template.format(**template_vars)
+            chunks = _render_template(self.template, self._template_tokens, template_vars)
             
             # Create output file path
             filename = f"journal_{journal_date.isoformat()}.md"
             output_file = self.output_dir / filename
             
             # Write to file
-            output_file.write_text(markdown_content, encoding='utf-8')
+            _write_file(output_file, chunks)
             
             logger.info(f"Journal exported to: {output_file}")
             return output_file
@@ -256,32 +352,28 @@ class MarkdownExporter:
             logger.error(f"Error exporting journal to markdown: {e}")
             return None
     
-    def export_weekly_summary(self, start_date: date, summary_data: Dict[str, Any]) -> Optional[Path]:
-        """Export weekly summary to markdown."""
+    def export_weekly_summary(self, start_date: date, summary_data: Dict[str, Any], generated_at: Optional[str] = None) -> Optional[Path]:
+        """Export weekly summary to markdown, stamped with generated_at or the current time."""
         try:
             end_date_str = summary_data.get('end_date', '')
             end_date_obj = datetime.fromisoformat(end_date_str).date() if end_date_str else start_date
             
-            content = f"""# Weekly Summary - {start_date.strftime('%B %d')} to {end_date_obj.strftime('%B %d, %Y')}
-
-## Overview
-- **Total Sites Visited**: {summary_data.get('total_sites_visited', 0)}
-- **Total Time Spent**: {self._format_time_duration(summary_data.get('total_time_spent', 0))}
-- **Average Productivity Score**: {summary_data.get('average_productivity_score', 0)}/10
-- **Days with Data**: {summary_data.get('daily_entries_count', 0)}
-
-## Top Categories This Week
-{self._format_categories(summary_data.get('top_categories', []))}
-
----
-*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} by Firefox History Journal Generator*"""
+            chunks = _render_template(WEEKLY_TEMPLATE, _WEEKLY_TOKENS, {
+                'period': f"{start_date.strftime('%B %d')} to {end_date_obj.strftime('%B %d, %Y')}",
+                'total_sites_visited': summary_data.get('total_sites_visited', 0),
+                'total_time': _format_time_duration(summary_data.get('total_time_spent', 0)),
+                'average_productivity_score': summary_data.get('average_productivity_score', 0),
+                'daily_entries_count': summary_data.get('daily_entries_count', 0),
+                'top_categories': _format_categories(summary_data.get('top_categories', [])),
+                'generated_at': generated_at or _generated_at()
+            })
             
             # Create output file path
             filename = f"weekly_summary_{start_date.isoformat()}.md"
             output_file = self.output_dir / filename
             
             # Write to file
-            output_file.write_text(content, encoding='utf-8')
+            _write_file(output_file, chunks)
             
             logger.info(f"Weekly summary exported to: {output_file}")
             return output_file
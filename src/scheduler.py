@@ -2,10 +2,15 @@ try:
     import schedule
 except ImportError:
     schedule = None
+import os
 import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import Optional
+from contextlib import contextmanager
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Optional
 import threading
 import signal
 import sys
@@ -17,22 +22,84 @@ from .markdown_exporter import MarkdownExporter
 
 logger = logging.getLogger(__name__)
 
+# Longest single wait between checks, so suspends and clock changes are noticed within a few minutes
+_MAX_IDLE_SECONDS = 300
+
+def _generate_and_export(journal_generator: JournalGenerator, markdown_exporter: MarkdownExporter, target_date: date,
+                         generated_at: Optional[str] = None) -> Optional[Path]:
+    """Generate one day's journal and export it to markdown, returning the file written if any."""
+    try:
+        logger.info(f"Starting journal generation for {target_date}")
+        
+        # Generate journal data
+        journal_data = journal_generator.generate_daily_journal(target_date)
+        
+        if journal_data:
+            # Export to markdown
+            output_file = markdown_exporter.export_daily_journal(target_date, journal_data, generated_at)
+            
+            if output_file:
+                logger.info(f"Journal successfully generated and exported for {target_date}")
+            else:
+                logger.warning(f"Journal data generated but export failed for {target_date}")
+            return output_file
+        else:
+            logger.info(f"No journal data to generate for {target_date}")
+            
+    except Exception as e:
+        logger.error(f"Error during journal generation for {target_date}: {e}")
+    return None
+
+# Components owned by a run_range worker process
+_worker_state = {}
+
+def _init_range_worker(config_path: str, generated_at: str):
+    """Build this process's own generator and exporter; SQLite connections can't cross processes."""
+    config = ConfigManager(config_path)
+    _worker_state['journal_generator'] = JournalGenerator(DatabaseManager(config.database_path))
+    _worker_state['markdown_exporter'] = MarkdownExporter(config.journal_output_dir, config.template_path)
+    _worker_state['generated_at'] = generated_at
+
+def _run_range_day(target_date: date) -> Optional[Path]:
+    """Generate and export one date using the components built by _init_range_worker."""
+    return _generate_and_export(
+        _worker_state['journal_generator'], _worker_state['markdown_exporter'], target_date, _worker_state['generated_at']
+    )
+
 class JournalScheduler:
     def __init__(self, config_manager: Optional[ConfigManager] = None):
         self.config = config_manager or ConfigManager()
-        self.db_manager = DatabaseManager(self.config.database_path)
-        self.journal_generator = JournalGenerator(self.db_manager)
-        self.markdown_exporter = MarkdownExporter(
-            self.config.journal_output_dir,
-            self.config.template_path
-        )
         
         self.running = False
         self.scheduler_thread = None
-        
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        self._stop_event = threading.Event()
+    
+    # The database, generator and exporter are built on first use, so a
+    # scheduler that never generates anything opens nothing
+    @cached_property
+    def db_manager(self) -> DatabaseManager:
+        return DatabaseManager(self.config.database_path)
+    
+    @cached_property
+    def journal_generator(self) -> JournalGenerator:
+        return JournalGenerator(self.db_manager)
+    
+    @cached_property
+    def markdown_exporter(self) -> MarkdownExporter:
+        return MarkdownExporter(
+            self.config.journal_output_dir,
+            self.config.template_path
+        )
+    
+    @contextmanager
+    def install_signals(self):
+        """Stop the scheduler and exit on SIGINT/SIGTERM while active, restoring the previous handlers afterwards."""
+        previous = {sig: signal.signal(sig, self._signal_handler) for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            yield
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
@@ -40,29 +107,9 @@ class JournalScheduler:
         self.stop()
         sys.exit(0)
     
-    def _generate_daily_journal(self, target_date: Optional[date] = None):
+    def _generate_daily_journal(self, target_date: Optional[date] = None) -> Optional[Path]:
         """Generate daily journal entry."""
-        target_date = target_date or date.today()
-        
-        try:
-            logger.info(f"Starting journal generation for {target_date}")
-            
-            # Generate journal data
-            journal_data = self.journal_generator.generate_daily_journal(target_date)
-            
-            if journal_data:
-                # Export to markdown
-                output_file = self.markdown_exporter.export_daily_journal(target_date, journal_data)
-                
-                if output_file:
-                    logger.info(f"Journal successfully generated and exported for {target_date}")
-                else:
-                    logger.warning(f"Journal data generated but export failed for {target_date}")
-            else:
-                logger.info(f"No journal data to generate for {target_date}")
-                
-        except Exception as e:
-            logger.error(f"Error during journal generation for {target_date}: {e}")
+        return _generate_and_export(self.journal_generator, self.markdown_exporter, target_date or date.today())
     
     def _run_scheduler(self):
         """Run the scheduler in a separate thread."""
@@ -75,10 +122,16 @@ class JournalScheduler:
         while self.running:
             try:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                
+                # Sleep until the next job is due; stop() wakes the wait immediately
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    idle = 60
+                if idle > 0:
+                    self._stop_event.wait(min(idle, _MAX_IDLE_SECONDS))
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
-                time.sleep(60)  # Continue running even if there's an error
+                self._stop_event.wait(60)  # Continue running even if there's an error
         
         logger.info("Scheduler thread stopped")
     
@@ -112,7 +165,7 @@ class JournalScheduler:
             # Get the start of the current week (Monday)
             today = date.today()
             days_since_monday = today.weekday()
-            monday = today - datetime.timedelta(days=days_since_monday)
+            monday = today - timedelta(days=days_since_monday)
             
             logger.info(f"Generating weekly summary starting from {monday}")
             
@@ -138,6 +191,7 @@ class JournalScheduler:
         
         self.setup_daily_schedule()
         self.running = True
+        self._stop_event.clear()
         
         # Start scheduler in a separate thread
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
@@ -151,6 +205,7 @@ class JournalScheduler:
             return
         
         self.running = False
+        self._stop_event.set()
         
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
@@ -164,13 +219,34 @@ class JournalScheduler:
         """Generate journal for a specific date without scheduling."""
         self._generate_daily_journal(target_date)
     
+    def run_range(self, start_date: date, end_date: date, max_workers: Optional[int] = None) -> Dict[date, Optional[Path]]:
+        """Generate journals for every date in a range, spreading the days across worker processes."""
+        dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        if not dates:
+            return {}
+        
+        # Every file in the run carries the same generation timestamp
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(dates))
+        if workers <= 1:
+            return {
+                target_date: _generate_and_export(self.journal_generator, self.markdown_exporter, target_date, generated_at)
+                for target_date in dates
+            }
+        
+        # Days are independent; each worker opens its own databases from the same config file
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_range_worker,
+                                 initargs=(str(self.config.config_path), generated_at)) as pool:
+            return dict(zip(dates, pool.map(_run_range_day, dates)))
+    
     def run_weekly_summary(self, start_date: Optional[date] = None):
         """Generate weekly summary without scheduling."""
         if start_date is None:
             # Default to the start of current week
             today = date.today()
             days_since_monday = today.weekday()
-            start_date = today - datetime.timedelta(days=days_since_monday)
+            start_date = today - timedelta(days=days_since_monday)
         
         try:
             summary_data = self.journal_generator.generate_weekly_summary(start_date)
@@ -222,11 +298,12 @@ def run_daemon():
     
     try:
         scheduler = JournalScheduler()
-        scheduler.start()
-        
-        # Keep the main thread alive
-        while scheduler.running:
-            time.sleep(1)
+        with scheduler.install_signals():
+            scheduler.start()
+            
+            # Keep the main thread alive
+            while scheduler.running:
+                time.sleep(1)
             
     except KeyboardInterrupt:
         logger.info("Received interrupt signal")
@@ -6,10 +6,9 @@ Interactive web dashboard with charts and analytics.
 
 import sys
 from pathlib import Path
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Any
+from datetime import date, timedelta
+from typing import Dict, List
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 import numpy as np
@@ -32,78 +31,182 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@st.cache_resource
+def get_db() -> DatabaseManager:
+    """Open the journal database once per server process and share it across reruns and sessions."""
+    config = ConfigManager()
+    return DatabaseManager(config.database_path)
+
+def _db_version() -> tuple:
+    """Return the modification times of the journal database and its WAL file."""
+    db_path = get_db().db_path
+    wal_path = db_path.with_name(db_path.name + '-wal')
+    return tuple(p.stat().st_mtime_ns if p.exists() else 0 for p in (db_path, wal_path))
+
+# A shared resource rather than cache_data, so cache hits skip a pickle round-trip of the
+# whole history; callers only ever read it or slice copies out of it
+@st.cache_resource(ttl=300, max_entries=1)  # Cache for 5 minutes
+def _load_all(db_version: tuple) -> pd.DataFrame:
+    """Load every journal entry; the cache is invalidated whenever the database file changes."""
+    db_manager = get_db()
+    first_date, last_date = db_manager.get_date_bounds()
+    if first_date is None:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame(db_manager.get_journal_entries_range(first_date, last_date))
+    if not df.empty:
+        # productivity_score stays float64: two-decimal scores such as 6.95 would round down in float32
+        df = df.astype({'total_sites_visited': 'int32', 'total_time_spent': 'int32'})
+        df['date'] = pd.to_datetime(df['date'])
+        # Formatted once here so reruns don't repeat strftime for the table and hover text
+        df['date_str'] = df['date'].dt.strftime('%Y-%m-%d')
+        hours, minutes = np.divmod(df['total_time_spent'].to_numpy(), 60)
+        minutes_str = minutes.astype(str)
+        df['time_formatted'] = np.where(hours > 0,
+                                        np.char.add(np.char.add(hours.astype(str), 'h '), np.char.add(minutes_str, 'm')),
+                                        np.char.add(minutes_str, 'm'))
+        scores = df['productivity_score']
+        df['productivity_label'] = scores.map('{:.1f}/10'.format)
+        df['status'] = np.select([scores >= 7, scores >= 5], ["🟢", "🟡"], default="🔴")
+    return df
+
+def _sites_frame(domain_stats: Dict[str, Dict]) -> pd.DataFrame:
+    """Flatten a day's domain_stats into one row per domain, in the order they were recorded."""
+    sites = pd.DataFrame.from_dict(domain_stats, orient='index')
+    sites = sites.reindex(columns=['time_spent', 'visits', 'category', 'titles'])
+    sites = sites.fillna({'time_spent': 0, 'visits': 0, 'category': 'Uncategorized'})
+    sites = sites.astype({'time_spent': 'int64', 'visits': 'int64'})
+    sites['title_count'] = sites['titles'].str.len().fillna(0).astype('int64')
+    return sites.rename_axis('domain').reset_index()
+
+def _title_examples(sites: pd.DataFrame, per_domain: int, limit: int) -> List[str]:
+    """Sample page titles from the first five domains, taking up to per_domain titles from each."""
+    titles = sites[['domain', 'titles']].head(5).explode('titles').dropna(subset=['titles'])
+    titles = titles[titles.groupby(level=0).cumcount() < per_domain]
+    # Skip very short titles
+    titles = titles[titles['titles'].str.len() > 10].head(limit)
+    return ("**" + titles['domain'] + "**: " + titles['titles']).tolist()
+
+@st.cache_resource(ttl=300, max_entries=1)
+def _load_all_hourly(db_version: tuple) -> Dict[date, Dict[str, np.ndarray]]:
+    """Load hourly stats for every recorded day in one query, as 24-slot arrays per metric."""
+    hourly = {}
+    for day, hours in get_db().get_daily_stats_range(date.min, date.max).items():
+        time_spent = np.zeros(24, dtype=np.int32)
+        sites_visited = np.zeros(24, dtype=np.int32)
+        for hour, stats in hours.items():
+            time_spent[hour] = stats['time_spent']
+            sites_visited[hour] = stats['sites_visited']
+        hourly[day] = {'time_spent': time_spent, 'sites_visited': sites_visited}
+    return hourly
+
+@st.cache_data(ttl=300)
+def _load_day(db_version: tuple, day: date):
+    """Load a day's summary, hourly stats and per-site frame from the cached history, without touching the database."""
+    df = _load_all(db_version)
+    day_stats = {}
+    sites = pd.DataFrame()
+    
+    rows = df[df['date'] == pd.Timestamp(day)] if not df.empty else df
+    if not rows.empty:
+        entry = rows.iloc[0]
+        day_stats = {
+            'sites': int(entry['total_sites_visited']),
+            'time': int(entry['total_time_spent']),
+            'productivity': entry['productivity_score']
+        }
+        
+        # Extract domain statistics from raw_data
+        raw_data = entry['raw_data'] or {}
+        domain_stats = raw_data.get('domain_stats', {})
+        if domain_stats:
+            sites = _sites_frame(domain_stats)
+    
+    # Get hourly stats for the day
+    hourly_stats = _load_all_hourly(db_version).get(day, {})
+    
+    return day_stats, hourly_stats, sites
+
 def load_data(days: int = 30, start_date=None, end_date=None):
-    """Load and cache journal data."""
+    """Load journal data, slicing the requested window out of the cached full history."""
     try:
-        config = ConfigManager()
-        db_manager = DatabaseManager(config.database_path)
+        db_version = _db_version()
         
         # Get entries for specified date range or recent entries
-        if start_date and end_date:
-            entries = db_manager.get_journal_entries_range(start_date, end_date)
-        else:
+        if not (start_date and end_date):
             end_date = date.today()
             start_date = end_date - timedelta(days=days)
-            entries = db_manager.get_journal_entries_range(start_date, end_date)
         
-        if not entries:
-            return pd.DataFrame(), {}, {}, {}
+        df = _load_all(db_version)
+        if df.empty:
+            return pd.DataFrame(), {}, {}, pd.DataFrame()
         
-        # Convert to DataFrame
-        df = pd.DataFrame(entries)
-        df['date'] = pd.to_datetime(df['date'])
+        df = df[df['date'].between(pd.Timestamp(start_date), pd.Timestamp(end_date))].reset_index(drop=True)
+        if df.empty:
+            return pd.DataFrame(), {}, {}, pd.DataFrame()
         
-        # Get today's entry
-        today_entry = db_manager.get_journal_entry(date.today())
-        today_stats = {}
-        today_sites = {}
-        
-        if today_entry:
-            today_stats = {
-                'sites': today_entry['total_sites_visited'],
-                'time': today_entry['total_time_spent'],
-                'productivity': today_entry['productivity_score']
-            }
-            
-            # Extract domain statistics from raw_data
-            raw_data = today_entry.get('raw_data', {})
-            domain_stats = raw_data.get('domain_stats', {})
-            today_sites = domain_stats
-        
-        # Get hourly stats for today
-        hourly_stats = db_manager.get_daily_stats(date.today())
+        today_stats, hourly_stats, today_sites = _load_day(db_version, date.today())
         
         return df, today_stats, hourly_stats, today_sites
         
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame(), {}, {}, {}
+        return pd.DataFrame(), {}, {}, pd.DataFrame()
 
 @st.cache_data(ttl=300)
 def get_date_range():
     """Get the available date range from the database."""
     try:
-        config = ConfigManager()
-        db_manager = DatabaseManager(config.database_path)
-        
-        # Get journal entries for a large date range to find min/max dates
-        # Use a very wide range to catch all possible entries
-        start_range = date(2020, 1, 1)  # Far past date
-        end_range = date.today() + timedelta(days=30)  # Future date
-        
-        all_entries = db_manager.get_journal_entries_range(start_range, end_range)
-        if not all_entries:
-            return None, None
-            
-        dates = [datetime.strptime(entry['date'], '%Y-%m-%d').date() for entry in all_entries]
-        return min(dates), max(dates)
+        return get_db().get_date_bounds()
         
     except Exception as e:
         if st.session_state.get('debug_mode', False):
             st.sidebar.error(f"Debug: Error getting date range: {e}")
         return None, None
 
+def _frame_digest(df: pd.DataFrame) -> tuple:
+    """Cheap fingerprint of a chart's input frame: its columns, length, numeric column sums and first key."""
+    if df.empty:
+        return (tuple(df.columns), 0)
+    return (tuple(df.columns), len(df), tuple(df.select_dtypes('number').sum().tolist()), str(df.iat[0, 0]))
+
+# Line charts longer than this are thinned before they are sent to the browser
+MAX_LINE_POINTS = 500
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick n_out indices that keep a series' visual shape, using Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # The first and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) if bucket < n_out - 3 else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the last kept point and the next bucket's average
+        areas = np.abs((x[selected] - avg_x) * (y[start:end] - y[selected])
+                       - (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(areas.argmax())
+        indices[bucket + 1] = selected
+    
+    return indices
+
+# Chart builders are pure functions of their input, so reruns triggered by unrelated widgets
+# reuse the figure; frames are keyed on a digest instead of hashing every cell
+_cache_chart = st.cache_data(ttl=300, max_entries=64, hash_funcs={pd.DataFrame: _frame_digest})
+
+@_cache_chart
 def create_productivity_chart(df: pd.DataFrame):
     """Create productivity trend chart."""
     if df.empty:
@@ -114,22 +217,27 @@ def create_productivity_chart(df: pd.DataFrame):
     fig = go.Figure()
     
     # Add productivity score line
+    dates = df['date'].to_numpy()
+    scores = df['productivity_score'].to_numpy()
+    positions = np.arange(len(df))
+    shown = _lttb_indices(dates.astype(np.int64), scores, MAX_LINE_POINTS)
+    
+    # numpy arrays are shipped to the browser as base64 typed arrays rather than JSON lists
     fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['productivity_score'],
+        x=dates[shown],
+        y=scores[shown],
         mode='lines+markers',
         name='Productivity Score',
         line=dict(color='#1f77b4', width=3),
         marker=dict(size=8)
     ))
     
-    # Add trend line
+    # Add trend line, fitted on every day even when the plotted line is thinned
     if len(df) > 1:
-        z = np.polyfit(range(len(df)), df['productivity_score'], 1)
-        p = np.poly1d(z)
+        slope, intercept = np.polyfit(positions, scores, 1)
         fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=p(range(len(df))),
+            x=dates[shown],
+            y=slope * positions[shown] + intercept,
             mode='lines',
             name='Trend',
             line=dict(color='red', width=2, dash='dash')
@@ -145,8 +253,11 @@ def create_productivity_chart(df: pd.DataFrame):
     
     return fig
 
+@_cache_chart
 def create_time_spent_chart(df: pd.DataFrame):
     """Create time spent bar chart."""
+    import plotly.express as px
+    
     if df.empty:
         return go.Figure()
     
@@ -163,8 +274,11 @@ def create_time_spent_chart(df: pd.DataFrame):
     fig.update_layout(hovermode='x unified')
     return fig
 
+@_cache_chart
 def create_sites_chart(df: pd.DataFrame):
     """Create sites visited chart."""
+    import plotly.express as px
+    
     if df.empty:
         return go.Figure()
     
@@ -180,20 +294,17 @@ def create_sites_chart(df: pd.DataFrame):
     
     return fig
 
-def create_hourly_chart(hourly_stats: Dict[int, Dict[str, int]]):
+@_cache_chart
+def create_hourly_chart(hourly_stats: Dict[str, np.ndarray]):
     """Create hourly activity chart."""
     if not hourly_stats:
         return go.Figure()
     
-    hours = list(range(24))
-    time_spent = [hourly_stats.get(hour, {}).get('time_spent', 0) for hour in hours]
-    sites_visited = [hourly_stats.get(hour, {}).get('sites_visited', 0) for hour in hours]
-    
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=hours,
-        y=time_spent,
+        x=np.arange(24, dtype=np.int32),
+        y=hourly_stats['time_spent'],
         name='Time Spent (min)',
         marker_color='lightblue'
     ))
@@ -207,6 +318,7 @@ def create_hourly_chart(hourly_stats: Dict[int, Dict[str, int]]):
     
     return fig
 
+@_cache_chart
 def create_correlation_chart(df: pd.DataFrame):
     """Create productivity vs time correlation."""
     if df.empty or len(df) < 2:
@@ -216,19 +328,22 @@ def create_correlation_chart(df: pd.DataFrame):
     
     fig = go.Figure()
     
-    # Add scatter plot points
-    fig.add_trace(go.Scatter(
-        x=df['total_time_spent'],
-        y=df['productivity_score'],
+    # Add scatter plot points; WebGL keeps pan and zoom smooth on long ranges
+    time_spent = df['total_time_spent'].to_numpy(dtype=np.int32)
+    scores = df['productivity_score'].to_numpy()
+    
+    fig.add_trace(go.Scattergl(
+        x=time_spent,
+        y=scores,
         mode='markers',
         marker=dict(
             size=10,
-            color=df['productivity_score'],
+            color=scores,
             colorscale='RdYlBu',
             colorbar=dict(title="Productivity Score"),
             line=dict(width=1, color='black')
         ),
-        text=df['date'].dt.strftime('%Y-%m-%d'),
+        text=df['date_str'].to_numpy(),
         hovertemplate='<b>%{text}</b><br>' +
                       'Time Spent: %{x} minutes<br>' +
                       'Productivity: %{y}/10<extra></extra>',
@@ -241,13 +356,12 @@ def create_correlation_chart(df: pd.DataFrame):
         correlation = df['total_time_spent'].corr(df['productivity_score'])
         
         # Add trend line manually
-        z = np.polyfit(df['total_time_spent'], df['productivity_score'], 1)
-        p = np.poly1d(z)
+        slope, intercept = np.polyfit(time_spent, scores, 1)
         
-        x_trend = [df['total_time_spent'].min(), df['total_time_spent'].max()]
-        y_trend = [p(x) for x in x_trend]
+        x_trend = np.array([time_spent.min(), time_spent.max()])
+        y_trend = slope * x_trend + intercept
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=x_trend,
             y=y_trend,
             mode='lines',
@@ -265,57 +379,42 @@ def create_correlation_chart(df: pd.DataFrame):
     
     return fig
 
-def create_sites_visited_chart(sites_data: Dict[str, Dict]):
+# Color mapping for categories
+CATEGORY_COLORS = {
+    'Development': '#2E8B57',
+    'Entertainment': '#FF6347', 
+    'Social Media': '#FF69B4',
+    'Research': '#4682B4',
+    'News': '#32CD32',
+    'Communication': '#9370DB',
+    'Shopping': '#FFD700',
+    'Professional': '#20B2AA',
+    'Reading': '#DDA0DD',
+    'Search': '#F0E68C',
+    'Uncategorized': '#808080'
+}
+
+@_cache_chart
+def create_sites_visited_chart(sites: pd.DataFrame):
     """Create top visited sites bar chart."""
-    if not sites_data:
+    if sites.empty:
         return go.Figure().add_annotation(text="No sites data available", 
                                         xref="paper", yref="paper",
                                         x=0.5, y=0.5, showarrow=False)
     
-    # Convert to list and sort by time spent
-    sites_list = []
-    for domain, stats in sites_data.items():
-        sites_list.append({
-            'domain': domain,
-            'time_spent': stats.get('time_spent', 0),
-            'visits': stats.get('visits', 0),
-            'category': stats.get('category', 'Uncategorized')
-        })
-    
-    # Sort by time spent and take top 15
-    sites_list = sorted(sites_list, key=lambda x: x['time_spent'], reverse=True)[:15]
-    
-    if not sites_list:
-        return go.Figure()
-    
-    # Create DataFrame for plotting
-    sites_df = pd.DataFrame(sites_list)
-    
-    # Color mapping for categories
-    color_map = {
-        'Development': '#2E8B57',
-        'Entertainment': '#FF6347', 
-        'Social Media': '#FF69B4',
-        'Research': '#4682B4',
-        'News': '#32CD32',
-        'Communication': '#9370DB',
-        'Shopping': '#FFD700',
-        'Professional': '#20B2AA',
-        'Reading': '#DDA0DD',
-        'Search': '#F0E68C',
-        'Uncategorized': '#808080'
-    }
+    # Take the top 15 by time spent
+    sites_df = sites.nlargest(15, 'time_spent')
     
     # Add colors
-    sites_df['color'] = sites_df['category'].map(lambda x: color_map.get(x, '#808080'))
+    sites_df['color'] = sites_df['category'].map(CATEGORY_COLORS).fillna('#808080')
     
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        y=sites_df['domain'],
-        x=sites_df['time_spent'],
+        y=sites_df['domain'].to_numpy(),
+        x=sites_df['time_spent'].to_numpy(dtype=np.int32),
         orientation='h',
-        marker_color=sites_df['color'],
+        marker_color=sites_df['color'].to_numpy(),
         customdata=list(zip(sites_df['visits'], sites_df['category'])),
         hovertemplate='<b>%{y}</b><br>' +
                       'Time: %{x} minutes<br>' +
@@ -332,17 +431,34 @@ def create_sites_visited_chart(sites_data: Dict[str, Dict]):
     
     return fig
 
+# History columns shown in the Recent Journal Entries table, with their headers
+ENTRY_TABLE_COLUMNS = {
+    'date_str': 'Date',
+    'total_sites_visited': 'Sites',
+    'time_formatted': 'Time',
+    'productivity_label': 'Productivity',
+    'status': 'Status'
+}
+
+def _select_journal_date(dates: List[str]):
+    """Open the details view for the row selected in the journal table."""
+    rows = st.session_state.journal_grid.selection.rows
+    if rows:
+        st.session_state.selected_date = dates[rows[0]]
+        st.session_state.show_details = True
+    else:
+        st.session_state.show_details = False
+
 def show_date_details(selected_date: str):
     """Display detailed statistics for a selected date."""
+    import plotly.express as px
+    
     try:
         from datetime import datetime
         target_date = datetime.strptime(selected_date, '%Y-%m-%d').date()
         
-        config = ConfigManager()
-        db_manager = DatabaseManager(config.database_path)
-        
         # Get journal entry for the selected date
-        entry = db_manager.get_journal_entry(target_date)
+        entry, hourly_stats, sites = _load_day(_db_version(), target_date)
         
         if not entry:
             st.error(f"No data found for {selected_date}")
@@ -363,28 +479,22 @@ def show_date_details(selected_date: str):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Sites Visited", entry['total_sites_visited'])
+            st.metric("Sites Visited", entry['sites'])
         
         with col2:
-            time_spent = entry['total_time_spent']
+            time_spent = entry['time']
             hours = time_spent // 60
             minutes = time_spent % 60
             st.metric("Total Time", f"{hours}h {minutes}m")
         
         with col3:
-            st.metric("Productivity Score", f"{entry['productivity_score']:.1f}/10")
+            st.metric("Productivity Score", f"{entry['productivity']:.1f}/10")
         
         with col4:
-            # Get hourly data for this date
-            hourly_stats = db_manager.get_daily_stats(target_date)
-            active_hours = len([h for h in hourly_stats.values() if h.get('time_spent', 0) > 0])
+            active_hours = int(np.count_nonzero(hourly_stats['time_spent'] > 0)) if hourly_stats else 0
             st.metric("Active Hours", active_hours)
         
-        # Extract detailed data from raw_data
-        raw_data = entry.get('raw_data', {})
-        domain_stats = raw_data.get('domain_stats', {})
-        
-        if domain_stats:
+        if not sites.empty:
             # Create two tabs for different views
             tab1, tab2, tab3 = st.tabs(["📈 Charts", "📋 Detailed Data", "🕒 Hourly Activity"])
             
@@ -393,59 +503,42 @@ def show_date_details(selected_date: str):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    sites_fig = create_sites_visited_chart(domain_stats)
+                    sites_fig = create_sites_visited_chart(sites)
                     sites_fig.update_layout(title=f"Top Sites - {selected_date}")
                     st.plotly_chart(sites_fig, width='stretch')
                 
                 with col2:
                     # Category breakdown pie chart
-                    categories = {}
-                    for domain, stats in domain_stats.items():
-                        category = stats.get('category', 'Uncategorized')
-                        time_spent = stats.get('time_spent', 0)
-                        
-                        if category not in categories:
-                            categories[category] = 0
-                        categories[category] += time_spent
+                    categories = sites.groupby('category', sort=False)['time_spent'].sum()
                     
-                    if categories:
+                    if not categories.empty:
                         fig = px.pie(
-                            values=list(categories.values()),
-                            names=list(categories.keys()),
+                            values=categories.to_numpy(),
+                            names=categories.index.to_numpy(),
                             title=f"Time by Category - {selected_date}"
                         )
                         st.plotly_chart(fig, width='stretch')
             
             with tab2:
                 # Detailed sites table
-                sites_data = []
-                for domain, stats in domain_stats.items():
-                    sites_data.append({
-                        'Domain': domain,
-                        'Time (min)': stats.get('time_spent', 0),
-                        'Visits': stats.get('visits', 0),
-                        'Category': stats.get('category', 'Uncategorized'),
-                        'Avg Time/Visit': round(stats.get('time_spent', 0) / max(stats.get('visits', 1), 1), 1),
-                        'Page Titles': len(stats.get('titles', []))
-                    })
-                
-                sites_df = pd.DataFrame(sites_data)
+                sites_df = pd.DataFrame({
+                    'Domain': sites['domain'],
+                    'Time (min)': sites['time_spent'],
+                    'Visits': sites['visits'],
+                    'Category': sites['category'],
+                    'Avg Time/Visit': (sites['time_spent'] / sites['visits'].clip(lower=1)).round(1),
+                    'Page Titles': sites['title_count']
+                })
                 sites_df = sites_df.sort_values('Time (min)', ascending=False)
                 
                 st.dataframe(sites_df, width='stretch')
                 
                 # Show some page titles
                 st.subheader("📄 Sample Page Titles")
-                title_examples = []
-                for domain, stats in list(domain_stats.items())[:5]:
-                    titles = stats.get('titles', [])
-                    if titles:
-                        for title in titles[:3]:  # Show up to 3 titles per domain
-                            if len(title) > 10:  # Skip very short titles
-                                title_examples.append(f"**{domain}**: {title}")
+                title_examples = _title_examples(sites, per_domain=3, limit=10)
                 
                 if title_examples:
-                    for example in title_examples[:10]:  # Show max 10 examples
+                    for example in title_examples:
                         st.text(example)
                 else:
                     st.info("No page titles available for this date")
@@ -458,19 +551,15 @@ def show_date_details(selected_date: str):
                     st.plotly_chart(hourly_fig, width='stretch')
                     
                     # Hourly breakdown table
-                    hourly_data = []
-                    for hour in range(24):
-                        stats = hourly_stats.get(hour, {})
-                        if stats.get('time_spent', 0) > 0:
-                            hourly_data.append({
-                                'Hour': f"{hour:02d}:00",
-                                'Time Spent (min)': stats.get('time_spent', 0),
-                                'Sites Visited': stats.get('sites_visited', 0),
-                                'Visits': stats.get('total_visits', 0)
-                            })
+                    active = np.flatnonzero(hourly_stats['time_spent'] > 0)
                     
-                    if hourly_data:
-                        hourly_df = pd.DataFrame(hourly_data)
+                    if active.size:
+                        hourly_df = pd.DataFrame({
+                            'Hour': [f"{hour:02d}:00" for hour in active],
+                            'Time Spent (min)': hourly_stats['time_spent'][active],
+                            'Sites Visited': hourly_stats['sites_visited'][active],
+                            'Visits': np.zeros(active.size, dtype=np.int32)
+                        })
                         st.dataframe(hourly_df, width='stretch')
                     else:
                         st.info("No hourly activity data available")
@@ -498,6 +587,8 @@ def main():
     with st.sidebar.expander("🔧 Debug Options"):
         if st.button("🔄 Force Refresh All Data"):
             st.cache_data.clear()
+            _load_all.clear()
+            _load_all_hourly.clear()
             st.rerun()
         
         if st.button("🐛 Debug Mode"):
@@ -522,7 +613,7 @@ def main():
         
         if date_option == "Recent days":
             days_to_show = st.sidebar.slider("Days to analyze", 1, 90, 14)
-            df, today_stats, hourly_stats, today_sites = load_data(days_to_show)
+            df, today_stats, hourly_stats, sites = load_data(days_to_show)
         else:
             # Custom date range
             col1, col2 = st.sidebar.columns(2)
@@ -546,17 +637,19 @@ def main():
             # Validate date range
             if start_date > end_date:
                 st.sidebar.error("Start date must be before end date")
-                df, today_stats, hourly_stats, today_sites = pd.DataFrame(), {}, {}, {}
+                df, today_stats, hourly_stats, sites = pd.DataFrame(), {}, {}, pd.DataFrame()
             else:
-                df, today_stats, hourly_stats, today_sites = load_data(None, start_date, end_date)
+                df, today_stats, hourly_stats, sites = load_data(None, start_date, end_date)
     else:
         # Fallback to days slider if no date range available
         st.sidebar.warning("No data available yet")
         days_to_show = st.sidebar.slider("Days to analyze", 1, 90, 14)
-        df, today_stats, hourly_stats, today_sites = load_data(days_to_show)
+        df, today_stats, hourly_stats, sites = load_data(days_to_show)
     
     if st.sidebar.button("🔄 Refresh Data"):
         st.cache_data.clear()
+        _load_all.clear()
+        _load_all_hourly.clear()
         st.rerun()
     
     if df.empty:
@@ -619,30 +712,23 @@ def main():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        sites_fig = create_sites_visited_chart(today_sites)
+        sites_fig = create_sites_visited_chart(sites)
         st.plotly_chart(sites_fig, width='stretch')
     
     with col2:
-        if today_sites:
+        if not sites.empty:
             st.subheader("Site Summary")
             
             # Category breakdown
-            categories = {}
-            total_time = 0
-            for domain, stats in today_sites.items():
-                category = stats.get('category', 'Uncategorized')
-                time_spent = stats.get('time_spent', 0)
-                total_time += time_spent
-                
-                if category not in categories:
-                    categories[category] = {'time': 0, 'sites': 0}
-                categories[category]['time'] += time_spent
-                categories[category]['sites'] += 1
+            categories = sites.groupby('category', sort=False).agg(
+                time=('time_spent', 'sum'), sites=('time_spent', 'size')
+            )
+            total_time = categories['time'].sum()
             
             # Show top categories
-            sorted_categories = sorted(categories.items(), key=lambda x: x[1]['time'], reverse=True)
+            top_categories = categories.sort_values('time', ascending=False, kind='stable').head(5)
             
-            for category, stats in sorted_categories[:5]:
+            for category, stats in top_categories.iterrows():
                 percentage = (stats['time'] / total_time * 100) if total_time > 0 else 0
                 st.metric(
                     category,
@@ -653,35 +739,25 @@ def main():
             st.info("No sites data available for today")
     
     # Detailed sites table
-    if today_sites:
+    if not sites.empty:
         with st.expander("📋 View All Visited Sites Details", expanded=False):
-            sites_data = []
-            for domain, stats in today_sites.items():
-                sites_data.append({
-                    'Domain': domain,
-                    'Time Spent (min)': stats.get('time_spent', 0),
-                    'Visits': stats.get('visits', 0),
-                    'Category': stats.get('category', 'Uncategorized'),
-                    'Titles Count': len(stats.get('titles', []))
-                })
-            
-            sites_df = pd.DataFrame(sites_data)
+            sites_df = pd.DataFrame({
+                'Domain': sites['domain'],
+                'Time Spent (min)': sites['time_spent'],
+                'Visits': sites['visits'],
+                'Category': sites['category'],
+                'Titles Count': sites['title_count']
+            })
             sites_df = sites_df.sort_values('Time Spent (min)', ascending=False)
             
             st.dataframe(sites_df, width='stretch')
             
             # Show some page titles if available
             st.subheader("📄 Sample Page Titles")
-            title_examples = []
-            for domain, stats in list(today_sites.items())[:5]:
-                titles = stats.get('titles', [])
-                if titles:
-                    for title in titles[:2]:  # Show up to 2 titles per domain
-                        if len(title) > 10:  # Skip very short titles
-                            title_examples.append(f"**{domain}**: {title}")
+            title_examples = _title_examples(sites, per_domain=2, limit=8)
             
             if title_examples:
-                for example in title_examples[:8]:  # Show max 8 examples
+                for example in title_examples:
                     st.text(example)
             else:
                 st.info("No page titles available")
@@ -695,46 +771,23 @@ def main():
     st.header("📋 Recent Journal Entries")
     
     if not df.empty:
-        # Prepare display data
-        display_df = df.copy()
-        display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
-        display_df['time_formatted'] = display_df['total_time_spent'].apply(
-            lambda x: f"{x//60}h {x%60}m" if x >= 60 else f"{x}m"
+        # Display columns are precomputed in the cached history, so this is only a column pick
+        display_df = df[list(ENTRY_TABLE_COLUMNS)].rename(columns=ENTRY_TABLE_COLUMNS)
+        dates = display_df['Date'].tolist()
+        
+        st.markdown("*Select a row to view detailed statistics*")
+        
+        # One Arrow-backed table instead of a row of widgets per entry; the callback
+        # only fires when the selection changes, so closing the details sticks
+        st.dataframe(
+            display_df,
+            hide_index=True,
+            width='stretch',
+            on_select=lambda: _select_journal_date(dates),
+            selection_mode='single-row',
+            key='journal_grid'
         )
         
-        # Create clickable entries using columns and buttons
-        st.markdown("*Click on a date to view detailed statistics*")
-        
-        # Display entries with clickable dates
-        for idx, row in display_df.iterrows():
-            col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
-            
-            with col1:
-                # Use button for clickable date
-                if st.button(f"📅 {row['date']}", key=f"date_{row['date']}", help="Click to view details"):
-                    st.session_state.selected_date = row['date']
-                    st.session_state.show_details = True
-            
-            with col2:
-                st.write(f"**{row['total_sites_visited']}** sites")
-            
-            with col3:
-                st.write(f"**{row['time_formatted']}**")
-            
-            with col4:
-                st.write(f"**{row['productivity_score']:.1f}/10**")
-            
-            with col5:
-                # Get productivity color
-                score = row['productivity_score']
-                if score >= 7:
-                    color = "🟢"
-                elif score >= 5:
-                    color = "🟡"
-                else:
-                    color = "🔴"
-                st.write(color)
-        
         # Show detailed view if a date is selected
         if st.session_state.get('show_details', False) and st.session_state.get('selected_date'):
             show_date_details(st.session_state.selected_date)
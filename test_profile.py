@@ -6,65 +6,96 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from src.firefox_parser import FirefoxParser
+from src.firefox_parser import FirefoxParser, _day_bounds, firefox_profiles_dir, visit_date
+from src.database import configure_connection
 import sqlite3
-from datetime import datetime, date
+from datetime import date
 import os
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 
-def test_profile(profile_path):
-    print(f"\n=== Testing profile: {profile_path} ===")
+# Total, date range and today's count in one statement; as separate scalar subqueries
+# MIN/MAX are single lookups on moz_historyvisits_dateindex and today's count is a range scan.
+# All aggregation stays in SQLite: each profile fetches exactly one row, so there is no
+# per-visit Python loop here to speed up.
+AGG_SQL = """
+    SELECT 
+        (SELECT COUNT(*) FROM moz_historyvisits) as total,
+        (SELECT MIN(visit_date) FROM moz_historyvisits) as earliest,
+        (SELECT MAX(visit_date) FROM moz_historyvisits) as latest,
+        (SELECT COUNT(*) FROM moz_historyvisits WHERE visit_date BETWEEN ? AND ?) as today
+"""
+
+def test_profile(profile_path, today, start_timestamp, end_timestamp):
+    # Lines are collected and returned so profiles checked in parallel still print in order
+    lines = [f"\n=== Testing profile: {profile_path} ==="]
+    emit = lines.append
     try:
         parser = FirefoxParser(profile_path)
-        print(f"Places database exists: {parser.places_db.exists()}")
+        emit(f"Places database exists: {parser.places_db.exists()}")
         
         if not parser.places_db.exists():
-            return
+            return "\n".join(lines)
             
-        # Check database directly
-        temp_db = parser._create_temp_db_copy()
+        # Check database directly; immutable=1 reads the live file in place without taking
+        # Firefox's lock, at the cost of not seeing visits still sitting in places.sqlite-wal
+        places_uri = f"{parser.places_db.resolve().as_uri()}?mode=ro&immutable=1"
         
-        with sqlite3.connect(temp_db) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM moz_historyvisits")
-            total_visits = cursor.fetchone()[0]
-            print(f"Total history visits: {total_visits}")
+        # closing() rather than the connection's own with-block, which only ends a transaction
+        # and would leave one open file per profile until garbage collection
+        with closing(sqlite3.connect(places_uri, uri=True)) as conn:
+            # Same mmap/cache tuning the parser uses for its snapshots
+            conn.execute("PRAGMA query_only=1")
+            configure_connection(conn, read_only=True)
+            
+            # A places.sqlite untouched since midnight can't hold today's visits, so give the
+            # today count an empty range that SQLite rejects with a single index probe
+            if parser.places_db.stat().st_mtime_ns // 1000 < start_timestamp:
+                today_range = (0, -1)
+            else:
+                today_range = (start_timestamp, end_timestamp)
+            
+            with closing(conn.execute(AGG_SQL, today_range)) as cursor:
+                total_visits, earliest_ts, latest_ts, today_visits = cursor.fetchone()
+            emit(f"Total history visits: {total_visits}")
             
             if total_visits > 0:
                 # Check date range
-                cursor = conn.execute("""
-                    SELECT 
-                        MIN(h.visit_date) as earliest,
-                        MAX(h.visit_date) as latest
-                    FROM moz_historyvisits h
-                """)
-                row = cursor.fetchone()
-                if row[0] and row[1]:
-                    earliest = datetime.fromtimestamp(row[0] / 1_000_000)
-                    latest = datetime.fromtimestamp(row[1] / 1_000_000)
-                    print(f"History date range: {earliest.date()} to {latest.date()}")
+                if earliest_ts and latest_ts:
+                    emit(f"History date range: {visit_date(earliest_ts)} to {visit_date(latest_ts)}")
                     
                 # Check for today's data
-                today = date.today()
-                start_timestamp = int(datetime.combine(today, datetime.min.time()).timestamp() * 1_000_000)
-                end_timestamp = int(datetime.combine(today, datetime.max.time()).timestamp() * 1_000_000)
-                
-                cursor = conn.execute("""
-                    SELECT COUNT(*) FROM moz_historyvisits h
-                    WHERE h.visit_date BETWEEN ? AND ?
-                """, (start_timestamp, end_timestamp))
-                today_visits = cursor.fetchone()[0]
-                print(f"Visits today ({today}): {today_visits}")
-        
-        temp_db.unlink(missing_ok=True)
+                emit(f"Visits today ({today}): {today_visits}")
         
     except Exception as e:
-        print(f"Error: {e}")
+        emit(f"Error: {e}")
+    
+    return "\n".join(lines)
 
 def main():
-    profiles_dir = Path(os.environ.get("APPDATA")) / "Mozilla" / "Firefox" / "Profiles"
+    # On Windows without APPDATA this is a relative path that won't exist either
+    profiles_dir = firefox_profiles_dir()
+    if not profiles_dir.is_dir():
+        print(f"Firefox profile directory not found: {profiles_dir}")
+        return
+    
+    # scandir's entries know their type from the directory read, so there's no stat per profile
+    with os.scandir(profiles_dir) as entries:
+        profiles = [entry.path for entry in entries if entry.is_dir()]
+    if not profiles:
+        return
+    
+    # Today's bounds in Firefox's microsecond timestamps, computed once for every profile
+    today = date.today()
+    start_timestamp, end_timestamp = _day_bounds(today)
     
-    for profile_dir in profiles_dir.iterdir():
-        if profile_dir.is_dir():
-            test_profile(str(profile_dir))
+    # Each profile has its own database file and connection, so they can be checked concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(profiles))) as executor:
+        reports = executor.map(test_profile, profiles, repeat(today), repeat(start_timestamp), repeat(end_timestamp))
+        # One write per profile keeps each block contiguous on stdout
+        for report in reports:
+            sys.stdout.write(report + "\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file